@@ -7,7 +7,7 @@ Usage:
     uv run python -m app [config_file] -p [port] -b [bind address]
 
     Or run directly with uvicorn (for production events):
-    uvicorn app.main:get_app --factory --host 0.0.0.0 --port 8000 --workers 4
+    uvicorn app.main:get_app --factory --host 0.0.0.0 --port 8000
 """
 
 import argparse
@@ -58,8 +58,12 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--workers",
         type=int,
-        default=4,
-        help="Number of worker processes for concurrent tile serving (default: 4).",
+        default=None,
+        help=(
+            "Number of worker processes (default: $WEB_CONCURRENCY or 1). Tile "
+            "serving is I/O-bound, so one async worker is usually enough; raise "
+            "for CPU-bound deployments."
+        ),
     )
     parser.add_argument(
         "--reload",
@@ -76,7 +80,18 @@ def parse_arguments() -> argparse.Namespace:
         action="store_true",
         help="Skip startup scan for faster boot (uses default zoom bounds).",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.workers is None:
+        web_concurrency = os.getenv("WEB_CONCURRENCY", "").strip()
+        try:
+            args.workers = int(web_concurrency) if web_concurrency else 1
+        except ValueError:
+            args.workers = 0
+        if args.workers < 1:
+            parser.error(
+                f"WEB_CONCURRENCY must be a positive integer, got {web_concurrency!r}"
+            )
+    return args
 
 
 def main() -> None:
@@ -183,7 +198,10 @@ def main() -> None:
     print("Starting Multi-Tileset Event Tile Server")
     print(f"Loading configuration from: {os.path.abspath(args.config)}")
     print(f"Listening on: http://{args.bind}:{args.port}")
-    print(f"Using {args.workers} worker processes for optimal tile serving")
+    print(
+        f"Using {args.workers} worker process{'es' if args.workers != 1 else ''} "
+        "for tile serving"
+    )
     print("Startup scan: {}".format("disabled" if args.no_scan else "enabled"))
     print(
         "Optimized for: Multiple tilesets, zoom levels 1-25, looping displays, interactive maps"
@@ -204,11 +222,14 @@ def main() -> None:
         "reload": args.reload,
         "loop": "uvloop",
         "http": "httptools",
-        "limit_concurrency": 100,
+        "limit_concurrency": 1000,
         "backlog": 256,
         "timeout_keep_alive": 300,
-        "limit_max_requests": 50000,
     }
+    # Recycling a worker after N requests only makes sense when the supervisor
+    # can restart it; a single-process server would simply exit.
+    if args.workers > 1:
+        uvicorn_config["limit_max_requests"] = 50000
 
     if args.event_mode:
         uvicorn_config.update(
@@ -1,18 +1,31 @@
 """Configuration loading and validation for the tile server."""
 
 import datetime
+import hashlib
+import itertools
 import json
 import logging
+import os
+import pickle
 import re
-import tarfile
+import stat
+import sys
 import time
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, TypedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, TypedDict
 
 from typing_extensions import NotRequired
 
-from app.utils import detect_tar_compression, is_tar_file, parse_tile_member_path
+from app.tar_manager import load_cached_tar_index
+from app.utils import (
+    check_tar_header,
+    detect_tar_compression,
+    has_tar_extension,
+    iter_tar_members,
+    parse_tile_member_path,
+    tar_open_mode,
+)
 
 logger = logging.getLogger("event_tile_server")
 
@@ -27,40 +40,120 @@ class TilesetConfig(TypedDict):
 
 # Valid tileset name pattern: alphanumeric, hyphens, underscores, must not start with digit
 VALID_TILESET_NAME = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_-]*$")
-TILE_PATTERN = re.compile(r"^(.*/)?(\d+)/(\d+)/(\d+\.\w+)$")
+# Per-entry scan loops only check the clock every 4096 entries
+_TIMEOUT_CHECK_MASK = 0xFFF
 DEFAULT_MIN_Z = 1
 DEFAULT_MAX_Z = 25
 
 
-def auto_detect_base_path(tar_path: Path, max_members: int = 100) -> Optional[str]:
+def auto_detect_base_path(
+    tar_path: Path, max_members: int = 20, min_hits: int = 3
+) -> Optional[str]:
     """
-    Auto-detect base_path by scanning first N members for tile patterns.
+    Auto-detect base_path by scanning the first members for tile patterns.
+
+    Stops as soon as one base has been seen min_hits times: archives almost
+    always have a single base directory, and on compressed tars every extra
+    header read means decompressing another member.
 
     Args:
         tar_path: Path to the tar archive.
         max_members: Maximum number of members to scan.
+        min_hits: Number of tiles under one base that settles the detection.
 
     Returns:
         Detected base_path or None if tiles are at root.
     """
-    detected_bases: List[str] = []
+    import tarfile  # deferred: directory-only deployments never need it
+
+    base_counts: Dict[str, int] = {}
+    best_base: Optional[str] = None
+    best_hits = 0
 
     # Let tarfile.open failures propagate — callers treat them as config errors.
-    with tarfile.open(tar_path, "r:*") as tar:
+    with tarfile.open(tar_path, tar_open_mode(tar_path)) as tar:
         try:
-            for i, member in enumerate(tar):
+            for i, member in enumerate(iter_tar_members(tar)):
                 if i >= max_members:
                     break
-                if member.isfile():
-                    match = TILE_PATTERN.match(member.name)
-                    if match and match.group(1):
-                        detected_bases.append(match.group(1).rstrip("/"))
+                if not member.isfile():
+                    continue
+                # "base/z/x/y.ext": only prefixed tiles contribute a base
+                parts = member.name.rsplit("/", 3)
+                if len(parts) == 4 and parts[1].isdecimal() and parts[2].isdecimal():
+                    y_stem, dot, ext = parts[3].partition(".")
+                    base = parts[0].rstrip("/")
+                    if base and y_stem.isdecimal() and dot and ext:
+                        hits = base_counts[base] = base_counts.get(base, 0) + 1
+                        if hits > best_hits:
+                            best_base, best_hits = base, hits
+                            if hits >= min_hits:
+                                break
         except Exception as e:
             logger.warning("Error reading tar members for %s: %s", tar_path, e)
 
-    if detected_bases:
-        return Counter(detected_bases).most_common(1)[0][0]
-    return None
+    return sys.intern(best_base) if best_base is not None else None
+
+
+# Validated configs keyed by (resolved config path, mtime_ns, size); each entry
+# also records source stamps so a changed tar or directory forces re-validation.
+# In-process only: the resolved source paths depend on the working directory
+# and on symlinks, neither of which the key captures. Workers spawned by
+# --workers N start with an empty cache and validate the config themselves.
+_VALIDATED_CACHE: Dict[Tuple[str, int, int], Tuple[Any, ...]] = {}
+
+
+def _source_stamps(tilesets: Dict[str, TilesetConfig]) -> Dict[str, Tuple[int, int]]:
+    """Return the (mtime_ns, size) stamp of every validated source path."""
+    stamps: Dict[str, Tuple[int, int]] = {}
+    for info in tilesets.values():
+        st = info["source_path"].stat()
+        stamps[str(info["source_path"])] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def _load_validated_config(
+    cache_key: Tuple[str, int, int],
+) -> Optional[Tuple[Dict[str, TilesetConfig], List[str]]]:
+    """
+    Look up a previous validation result for an unchanged config file.
+
+    A hit is only returned if every configured source still resolves to the
+    path it resolved to when validated (relative paths and symlinks can
+    point elsewhere now) and still has the stamp it had then.
+
+    Returns:
+        (validated_tilesets, warnings) or None on a miss.
+    """
+    entry = _VALIDATED_CACHE.get(cache_key)
+    if entry is None:
+        return None
+
+    validated_tilesets, warnings, stamps, raw_sources = entry
+    try:
+        for name, raw_source in raw_sources.items():
+            if Path(raw_source).resolve() != validated_tilesets[name]["source_path"]:
+                return None
+        if _source_stamps(validated_tilesets) != stamps:
+            return None
+    except OSError:
+        return None
+
+    return validated_tilesets, warnings
+
+
+def _store_validated_config(
+    cache_key: Tuple[str, int, int],
+    validated_tilesets: Dict[str, TilesetConfig],
+    warnings: List[str],
+    raw_sources: Dict[str, str],
+) -> None:
+    """Record a validation result, with the source strings it was resolved from."""
+    try:
+        stamps = _source_stamps(validated_tilesets)
+    except OSError:
+        return
+    _VALIDATED_CACHE[cache_key] = (validated_tilesets, warnings, stamps, raw_sources)
 
 
 def load_tileset_config(
@@ -98,6 +191,26 @@ def load_tileset_config(
     if not config_file.exists():
         raise ValueError(f"Config file not found: {config_path}")
 
+    # A single-process server re-loads the config MAIN already validated; reuse
+    # that result instead of re-opening every tar archive.
+    try:
+        config_stat = config_file.stat()
+        cache_key = (
+            str(config_file.resolve()),
+            config_stat.st_mtime_ns,
+            config_stat.st_size,
+        )
+    except OSError:
+        cache_key = None
+    cached = _load_validated_config(cache_key) if cache_key else None
+    if cached is not None:
+        cached_tilesets, cached_warnings = cached
+        if cached_warnings and show_warnings:
+            logger.warning("Configuration warnings:")
+            for warning in cached_warnings:
+                logger.warning(warning)
+        return cached_tilesets
+
     try:
         with open(config_file, "r") as f:
             config_data = json.load(f)
@@ -120,6 +233,8 @@ def load_tileset_config(
     errors: List[str] = []
     warnings: List[str] = []
     validated_tilesets: Dict[str, TilesetConfig] = {}
+    # Source strings as written, re-resolved on every validation cache hit
+    raw_sources: Dict[str, str] = {}
 
     for name, config_value in tilesets.items():
         # Validate tileset name
@@ -162,6 +277,7 @@ def load_tileset_config(
             continue
 
         # Validate and resolve path
+        raw_sources[name] = source_path_str
         try:
             resolved_path = Path(source_path_str).resolve()
         except Exception as e:
@@ -170,13 +286,21 @@ def load_tileset_config(
             )
             continue
 
-        # Check path exists
-        if not resolved_path.exists():
+        # Check path exists. The one stat() also decides the source type, so
+        # directory-only configs never pay for is_tar_file()/is_dir() lookups.
+        try:
+            source_mode = resolved_path.stat().st_mode
+        except (FileNotFoundError, NotADirectoryError):
             errors.append(f"• Tileset '{name}': Path does not exist: {resolved_path}")
             continue
+        except OSError as e:
+            errors.append(
+                f"• Tileset '{name}': Error accessing path '{resolved_path}': {e}"
+            )
+            continue
 
         # Determine if this is a tar file or directory
-        if is_tar_file(resolved_path):
+        if stat.S_ISREG(source_mode) and has_tar_extension(resolved_path):
             # Validate tar file
             try:
                 compression = detect_tar_compression(resolved_path)
@@ -203,14 +327,14 @@ def load_tileset_config(
                         )
                 else:
                     # base_path explicitly provided — auto-detect was skipped,
-                    # so validate the tar opens here.
-                    with tarfile.open(resolved_path, "r:*") as _tar:
-                        pass
+                    # so check the first header block instead of opening the tar.
+                    check_tar_header(resolved_path)
 
                 validated_tilesets[name] = {
                     "source_type": "tar",
                     "source_path": resolved_path,
-                    "base_path": base_path or "",
+                    # Interned: the same base recurs across tilesets sharing a tar
+                    "base_path": sys.intern(base_path or ""),
                 }
 
             except Exception as e:
@@ -221,7 +345,7 @@ def load_tileset_config(
 
         else:
             # Validate directory
-            if not resolved_path.is_dir():
+            if not stat.S_ISDIR(source_mode):
                 errors.append(
                     f"• Tileset '{name}': Path is not a directory or tar file: {resolved_path}"
                 )
@@ -258,9 +382,96 @@ def load_tileset_config(
         for warning in warnings:
             logger.warning(warning)
 
+    if cache_key:
+        _store_validated_config(cache_key, validated_tilesets, warnings, raw_sources)
+
     return validated_tilesets
 
 
+# Column directories modified this recently are not cached: a change within
+# the filesystem's timestamp granularity could leave the mtime unchanged.
+_SCAN_CACHE_RACY_NS = 2_000_000_000
+
+
+def _scan_cache_file(source_path: Path) -> Optional[Path]:
+    """
+    Return the per-column tile count cache file for a directory tileset.
+
+    The cache is opt-in: None unless TILE_SCAN_CACHE_DIR names a directory.
+    """
+    cache_dir = os.environ.get("TILE_SCAN_CACHE_DIR")
+    if not cache_dir:
+        return None
+    path_hash = hashlib.md5(str(source_path).encode()).hexdigest()[:8]
+    return Path(cache_dir) / f"scan_{path_hash}.pkl"
+
+
+def _load_scan_cache(source_path: Path) -> Dict[str, Tuple[int, int]]:
+    """Load {x directory path: (mtime_ns, tile count)} from a previous scan."""
+    cache_file = _scan_cache_file(source_path)
+    if cache_file is None:
+        return {}
+    try:
+        with open(cache_file, "rb") as f:
+            entry = pickle.load(f)
+    except Exception:
+        return {}
+    if not isinstance(entry, tuple) or len(entry) != 2 or entry[0] != str(source_path):
+        return {}
+    return entry[1]
+
+
+def _store_scan_cache(source_path: Path, counts: Dict[str, Tuple[int, int]]) -> None:
+    """Best-effort atomic write of per-column tile counts for the next scan."""
+    cache_file = _scan_cache_file(source_path)
+    if cache_file is None:
+        return
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, "wb") as f:
+            pickle.dump((str(source_path), counts), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except Exception as e:
+        logger.debug("Could not write scan cache %s: %s", cache_file, e)
+
+
+def _summarize_tar_members(
+    member_paths: Iterable[str], base_path: str, max_samples: int
+) -> Tuple[int, List[str], Set[int]]:
+    """
+    Count the distinct tiles of a tileset among tar member paths.
+
+    Members outside base_path are skipped, and tiles are keyed as
+    "z/x/y.ext" with integer z and x, the form tile requests are looked up
+    by, so "05/07/1.png" and "5/7/1.png" count once.
+
+    Args:
+        member_paths: File member names, in archive order.
+        base_path: Optional base path inside the archive.
+        max_samples: Maximum sample tiles to collect.
+
+    Returns:
+        Tuple of (tile_count, sample_tiles, zoom_levels).
+    """
+    prefix = base_path.strip("/") + "/" if base_path else ""
+    tile_keys: Dict[str, None] = {}
+    zoom_levels: Set[int] = set()
+    for member_path in member_paths:
+        if prefix:
+            if not member_path.startswith(prefix):
+                continue
+            member_path = member_path[len(prefix) :]
+        parsed = parse_tile_member_path(member_path)
+        if parsed is None:
+            continue
+        z_str, x_str, y_name = parsed
+        z = int(z_str)
+        zoom_levels.add(z)
+        tile_keys[f"{z}/{int(x_str)}/{y_name}"] = None
+    return len(tile_keys), list(itertools.islice(tile_keys, max_samples)), zoom_levels
+
+
 def scan_tiles(
     source_path: Path,
     source_type: str,
@@ -282,48 +493,78 @@ def scan_tiles(
         Tuple of (tile_count, sample_tiles, zoom_levels_sorted, min_zoom, max_zoom, scan_complete).
         scan_complete is False if the scan was interrupted by the timeout.
     """
-    start_time = time.time()
+    deadline = time.monotonic() + timeout_seconds
     tile_count = 0
     timed_out = False
     sample_tiles: List[str] = []
     zoom_levels_found: Set[int] = set()
 
     if source_type == "directory":
+        # os.scandir reuses the d_type from readdir, so is_dir()/is_file() only
+        # stat() symlinked entries instead of every entry.
         # Phase 1: discover ALL zoom directories immediately (cheap name listing).
-        z_dirs = sorted(
-            [d for d in source_path.iterdir() if d.is_dir() and d.name.isdigit()],
-            key=lambda d: int(d.name),
-        )
-        for z_dir in z_dirs:
-            zoom_levels_found.add(int(z_dir.name))
+        with os.scandir(source_path) as entries:
+            z_dirs = sorted(
+                (int(entry.name), entry.path)
+                for entry in entries
+                if entry.name.isdigit() and entry.is_dir()
+            )
+        for z, _ in z_dirs:
+            zoom_levels_found.add(z)
 
         # Phase 2: count tiles per zoom, checking timeout at every loop level.
+        # Adding or removing a tile changes its x directory's mtime, so a
+        # column whose mtime matches the previous scan reuses its count
+        # instead of being listed again.
         timed_out = False
-        for z_dir in z_dirs:
-            if timed_out or time.time() - start_time > timeout_seconds:
+        scan_cache = _load_scan_cache(source_path)
+        fresh_counts: Dict[str, Tuple[int, int]] = {}
+        racy_cutoff = time.time_ns() - _SCAN_CACHE_RACY_NS
+        for z, z_path in z_dirs:
+            if timed_out or time.monotonic() > deadline:
                 logger.warning(
                     "Scan timeout reached for %s after %d tiles",
                     source_path.name,
                     tile_count,
                 )
                 break
-            z = int(z_dir.name)
-            for x_dir in z_dir.iterdir():
-                if time.time() - start_time > timeout_seconds:
-                    timed_out = True
-                    break
-                if x_dir.is_dir() and x_dir.name.isdigit():
-                    x = int(x_dir.name)
-                    for tile_file in x_dir.iterdir():
-                        if time.time() - start_time > timeout_seconds:
-                            timed_out = True
-                            break
-                        if tile_file.is_file():
-                            tile_count += 1
-                            if len(sample_tiles) < max_samples:
-                                sample_tiles.append(f"{z}/{x}/{tile_file.name}")
-                    if timed_out:
+            with os.scandir(z_path) as x_entries:
+                for x_entry in x_entries:
+                    if time.monotonic() > deadline:
+                        timed_out = True
                         break
+                    if x_entry.name.isdigit() and x_entry.is_dir():
+                        x = int(x_entry.name)
+                        x_mtime = x_entry.stat().st_mtime_ns
+                        cached = scan_cache.get(x_entry.path)
+                        if (
+                            cached is not None
+                            and cached[0] == x_mtime
+                            and len(sample_tiles) >= max_samples
+                        ):
+                            tile_count += cached[1]
+                            fresh_counts[x_entry.path] = cached
+                            continue
+                        x_count = 0
+                        with os.scandir(x_entry.path) as tile_entries:
+                            for i, tile_entry in enumerate(tile_entries):
+                                if (
+                                    i & _TIMEOUT_CHECK_MASK == 0
+                                    and time.monotonic() > deadline
+                                ):
+                                    timed_out = True
+                                    break
+                                if tile_entry.is_file():
+                                    x_count += 1
+                                    if len(sample_tiles) < max_samples:
+                                        sample_tiles.append(
+                                            f"{z}/{x}/{tile_entry.name}"
+                                        )
+                        tile_count += x_count
+                        if timed_out:
+                            break
+                        if x_mtime < racy_cutoff:
+                            fresh_counts[x_entry.path] = (x_mtime, x_count)
             if timed_out:
                 logger.warning(
                     "Scan timeout reached for %s after %d tiles",
@@ -331,47 +572,47 @@ def scan_tiles(
                     tile_count,
                 )
                 break
+        if fresh_counts != scan_cache:
+            _store_scan_cache(source_path, fresh_counts)
 
     elif source_type == "tar":
-        # Tar archive scanning logic
-        normalized_base = base_path.strip("/") + "/" if base_path else ""
-
-        try:
-            with tarfile.open(source_path, "r:*") as tar:
-                for member in tar:
-                    if time.time() - start_time > timeout_seconds:
-                        timed_out = True
-                        logger.warning(
-                            "Scan timeout reached for %s after %d tiles",
-                            source_path.name,
-                            tile_count,
-                        )
-                        break
-
-                    if not member.isfile():
-                        continue
-
-                    # Remove base_path prefix if present
-                    member_path = member.name
-                    if normalized_base and member_path.startswith(normalized_base):
-                        member_path = member_path[len(normalized_base) :]
+        # A fresh .idx cache already holds every member header — derive the
+        # metadata from it instead of walking the archive again. Either way the
+        # member names go through _summarize_tar_members, so both report the
+        # same tiles.
+        cached_index = load_cached_tar_index(source_path)
+        if cached_index is not None:
+            member_paths: Iterable[str] = cached_index
+        else:
+            # Tar archive scanning logic
+            import tarfile
 
-                    parsed = parse_tile_member_path(member_path)
-                    if parsed:
-                        z_str, x_str, y_name = parsed
-                        z, x = int(z_str), int(x_str)
-                        zoom_levels_found.add(z)
-                        tile_count += 1
-                        if len(sample_tiles) < max_samples:
-                            sample_tiles.append(f"{z}/{x}/{y_name}")
+            walked: Dict[str, None] = {}
+            try:
+                with tarfile.open(source_path, tar_open_mode(source_path)) as tar:
+                    for i, member in enumerate(iter_tar_members(tar)):
+                        if i & _TIMEOUT_CHECK_MASK == 0 and time.monotonic() > deadline:
+                            timed_out = True
+                            logger.warning(
+                                "Scan timeout reached for %s after %d members",
+                                source_path.name,
+                                len(walked),
+                            )
+                            break
+                        if member.isfile():
+                            walked[member.name] = None
+            except Exception as e:
+                logger.error("Error scanning tar file %s: %s", source_path, e)
+            member_paths = walked
 
-        except Exception as e:
-            logger.error("Error scanning tar file %s: %s", source_path, e)
+        tile_count, sample_tiles, zoom_levels_found = _summarize_tar_members(
+            member_paths, base_path, max_samples
+        )
 
     if zoom_levels_found:
-        min_zoom = min(zoom_levels_found)
-        max_zoom = max(zoom_levels_found)
         zoom_levels_sorted = sorted(zoom_levels_found)
+        min_zoom = zoom_levels_sorted[0]
+        max_zoom = zoom_levels_sorted[-1]
     else:
         min_zoom = DEFAULT_MIN_Z
         max_zoom = DEFAULT_MAX_Z
@@ -387,88 +628,113 @@ def scan_tiles(
     )
 
 
-def scan_all_tilesets(
-    tilesets: Dict[str, TilesetConfig],
-) -> Dict[str, Dict[str, Any]]:
+def _scan_tileset(tileset_name: str, tileset_info: TilesetConfig) -> Dict[str, Any]:
     """
-    Scan all configured tilesets for metadata.
+    Scan a single tileset and build its metadata dictionary.
+
+    Module-level so it can be pickled into a process pool worker. Errors are
+    recorded in the returned metadata rather than raised.
 
     Args:
-        tilesets: Dictionary from load_tileset_config with metadata for each tileset.
+        tileset_name: Name of the tileset.
+        tileset_info: TilesetConfig entry from load_tileset_config.
 
     Returns:
-        Dictionary mapping tileset names to their metadata dictionaries.
+        Metadata dictionary for the tileset.
     """
-    all_metadata: Dict[str, Dict[str, Any]] = {}
-
-    for tileset_name, tileset_info in tilesets.items():
-        source_path: Path = tileset_info["source_path"]
-        source_type: str = tileset_info["source_type"]
-        base_path: str = tileset_info.get("base_path", "")
-
-        logger.info(
-            "Scanning tileset '%s' (%s) at %s",
-            tileset_name,
-            source_type,
-            source_path,
+    source_path: Path = tileset_info["source_path"]
+    source_type: str = tileset_info["source_type"]
+    base_path: str = tileset_info.get("base_path", "")
+
+    logger.info(
+        "Scanning tileset '%s' (%s) at %s",
+        tileset_name,
+        source_type,
+        source_path,
+    )
+
+    try:
+        tile_count, sample_tiles, zoom_levels, min_zoom, max_zoom, scan_complete = (
+            scan_tiles(
+                source_path=source_path,
+                source_type=source_type,
+                base_path=base_path,
+            )
         )
 
-        try:
-            tile_count, sample_tiles, zoom_levels, min_zoom, max_zoom, scan_complete = (
-                scan_tiles(
-                    source_path=source_path,
-                    source_type=source_type,
-                    base_path=base_path,
-                )
+        # Add tileset name to sample tile paths
+        sample_tiles_with_tileset = [f"/{tileset_name}/{tile}" for tile in sample_tiles]
+
+        metadata: Dict[str, Any] = {
+            "source_path": str(source_path),
+            "source_type": source_type,
+            "base_path": base_path,
+            "tile_count": tile_count,
+            "tile_count_complete": scan_complete,
+            "sample_tiles": sample_tiles_with_tileset,
+            "zoom_levels": zoom_levels,
+            "min_zoom": min_zoom,
+            "max_zoom": max_zoom,
+            "scanned_at": datetime.datetime.now().isoformat(),
+        }
+
+        if zoom_levels:
+            logger.info(
+                "Tileset '%s': %d tiles, zoom levels %d-%d",
+                tileset_name,
+                tile_count,
+                min_zoom,
+                max_zoom,
+            )
+        else:
+            logger.info(
+                "Tileset '%s': %d tiles, no zoom structure detected",
+                tileset_name,
+                tile_count,
             )
+        return metadata
 
-            # Add tileset name to sample tile paths
-            sample_tiles_with_tileset = [
-                f"/{tileset_name}/{tile}" for tile in sample_tiles
-            ]
-
-            all_metadata[tileset_name] = {
-                "source_path": str(source_path),
-                "source_type": source_type,
-                "base_path": base_path,
-                "tile_count": tile_count,
-                "tile_count_complete": scan_complete,
-                "sample_tiles": sample_tiles_with_tileset,
-                "zoom_levels": zoom_levels,
-                "min_zoom": min_zoom,
-                "max_zoom": max_zoom,
-                "scanned_at": datetime.datetime.now().isoformat(),
-            }
+    except Exception as e:
+        logger.error("Error scanning tileset '%s': %s", tileset_name, e)
+        return {
+            "source_path": str(source_path),
+            "source_type": source_type,
+            "base_path": base_path,
+            "tile_count": 0,
+            "tile_count_complete": False,
+            "sample_tiles": [],
+            "zoom_levels": [],
+            "min_zoom": DEFAULT_MIN_Z,
+            "max_zoom": DEFAULT_MAX_Z,
+            "scanned_at": datetime.datetime.now().isoformat(),
+            "error": str(e),
+        }
 
-            if zoom_levels:
-                logger.info(
-                    "Tileset '%s': %d tiles, zoom levels %d-%d",
-                    tileset_name,
-                    tile_count,
-                    min_zoom,
-                    max_zoom,
-                )
-            else:
-                logger.info(
-                    "Tileset '%s': %d tiles, no zoom structure detected",
-                    tileset_name,
-                    tile_count,
-                )
 
-        except Exception as e:
-            logger.error("Error scanning tileset '%s': %s", tileset_name, e)
-            all_metadata[tileset_name] = {
-                "source_path": str(source_path),
-                "source_type": source_type,
-                "base_path": base_path,
-                "tile_count": 0,
-                "tile_count_complete": False,
-                "sample_tiles": [],
-                "zoom_levels": [],
-                "min_zoom": DEFAULT_MIN_Z,
-                "max_zoom": DEFAULT_MAX_Z,
-                "scanned_at": datetime.datetime.now().isoformat(),
-                "error": str(e),
-            }
+def scan_all_tilesets(
+    tilesets: Dict[str, TilesetConfig],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Scan all configured tilesets for metadata.
+
+    Tilesets are independent, so with more than one they are scanned in
+    parallel across a process pool; startup then takes as long as the slowest
+    scan rather than the sum of all of them.
 
-    return all_metadata
+    Args:
+        tilesets: Dictionary from load_tileset_config with metadata for each tileset.
+
+    Returns:
+        Dictionary mapping tileset names to their metadata dictionaries.
+    """
+    if len(tilesets) <= 1:
+        return {name: _scan_tileset(name, info) for name, info in tilesets.items()}
+
+    max_workers = min(len(tilesets), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            name: pool.submit(_scan_tileset, name, info)
+            for name, info in tilesets.items()
+        }
+        # Collect in config order so the metadata dict stays deterministic.
+        return {name: future.result() for name, future in futures.items()}
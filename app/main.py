@@ -13,29 +13,37 @@ Usage:
     python -m app [config_file] -p [port] -b [bind address]
 
     Or run directly with uvicorn (for production events):
-    uvicorn app.main:get_app --factory --host 0.0.0.0 --port 8000 --workers 4
+    uvicorn app.main:get_app --factory --host 0.0.0.0 --port 8000
+
+    Or under gunicorn, one Uvicorn worker per core:
+    gunicorn 'app.main:get_app()' -k uvicorn.workers.UvicornWorker --workers 4
+
+    Only `python -m app` pre-scans directory tilesets once for all workers;
+    with uvicorn/gunicorn set TILE_SCAN=0 or TILE_METADATA_FILE.
 """
 
 import asyncio
 import datetime
-import email.utils
 import hashlib
-import json
 import logging
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, NamedTuple, Optional
 
+import anyio.to_thread
+import orjson
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse
+from starlette.routing import Route
 
 from app.config import (
     DEFAULT_MAX_Z,
     DEFAULT_MIN_Z,
+    TilesetConfig,
     load_tileset_config,
     scan_tiles,
 )
@@ -47,11 +55,171 @@ from app.exceptions import (
     TileServerError,
     TilesetNotFoundError,
 )
+from app.middleware import SecurityHeadersMiddleware
 from app.tar_manager import TarManager
-from app.utils import find_tile_path, media_type_for_suffix
+from app.tile_cache import (
+    DEFAULT_TILE_CACHE_BYTES,
+    EtagCache,
+    TileCache,
+    TileCacheMiddleware,
+)
+from app.utils import (
+    DEFAULT_MEDIA_TYPE,
+    MAX_INLINE_TILE_SIZE,
+    MEDIA_TYPES,
+    TILE_CACHE_CONTROL,
+    etag_matches,
+    http_date,
+    is_not_modified,
+    read_tile_file,
+    split_y_name,
+    weak_etag,
+)
 
 logger = logging.getLogger("event_tile_server")
 
+# Worker threads available for blocking file I/O (FileResponse reads, stats).
+# A single async worker relies on this pool instead of extra processes.
+BLOCKING_IO_THREADS = 64
+
+# Default size of the tile-io pool that probes and reads directory tiles
+# (override with TILE_IO_THREADS). The asyncio default executor is capped at
+# min(32, cpu_count + 4), too few for slow or network-backed disks.
+DIRECTORY_IO_THREADS = 64
+
+# Tile count per axis (2**z) for each zoom; covers DEFAULT_MAX_Z with headroom.
+# Scanned tilesets can report deeper zooms, which fall back to a shift.
+_ZOOM_BOUNDS = tuple(1 << z for z in range(32))
+
+
+class TileRoute(NamedTuple):
+    """Per-tileset values get_tile needs, flattened for a single lookup."""
+
+    min_zoom: int
+    max_zoom: int
+    source_type: str
+    source_path: Path
+    base_path: str
+
+
+def _tile_route(tileset_info: TilesetConfig, metadata: Dict[str, Any]) -> TileRoute:
+    """Build the TileRoute for a tileset from its config and current metadata."""
+    return TileRoute(
+        metadata["min_zoom"],
+        metadata["max_zoom"],
+        tileset_info["source_type"],
+        tileset_info["source_path"],
+        tileset_info.get("base_path", ""),
+    )
+
+
+async def _scan_directory_tileset(
+    tileset_name: str, source_path: Path
+) -> Dict[str, Any]:
+    """Scan one directory tileset on a worker thread and build its metadata."""
+    logger.info("Scanning directory tileset '%s'...", tileset_name)
+    try:
+        (
+            tile_count,
+            sample_tiles,
+            zoom_levels,
+            min_zoom,
+            max_zoom,
+            scan_complete,
+        ) = await asyncio.to_thread(
+            scan_tiles,
+            source_path=source_path,
+            source_type="directory",
+        )
+        metadata = {
+            "source_path": str(source_path),
+            "source_type": "directory",
+            "base_path": "",
+            "tile_count": tile_count,
+            "tile_count_complete": scan_complete,
+            "sample_tiles": [f"/{tileset_name}/{t}" for t in sample_tiles],
+            "zoom_levels": zoom_levels,
+            "min_zoom": min_zoom,
+            "max_zoom": max_zoom,
+            "scanned_at": datetime.datetime.now().isoformat(),
+        }
+        if zoom_levels:
+            logger.info(
+                "Tileset '%s': %d tiles, zoom %d-%d",
+                tileset_name,
+                tile_count,
+                min_zoom,
+                max_zoom,
+            )
+        else:
+            logger.info(
+                "Tileset '%s': %d tiles, no zoom structure detected",
+                tileset_name,
+                tile_count,
+            )
+        return metadata
+    except Exception as e:
+        logger.error("Error scanning directory tileset '%s': %s", tileset_name, e)
+        return {
+            "source_path": str(source_path),
+            "source_type": "directory",
+            "base_path": "",
+            "tile_count": 0,
+            "tile_count_complete": False,
+            "sample_tiles": [],
+            "zoom_levels": [],
+            "min_zoom": DEFAULT_MIN_Z,
+            "max_zoom": DEFAULT_MAX_Z,
+            "scanned_at": datetime.datetime.now().isoformat(),
+        }
+
+
+def _root_body(tileset_metadata: Dict[str, Any]) -> bytes:
+    """Render the GET / response body; rebuilt only when metadata changes."""
+    tilesets_info = {}
+    total_tiles = 0
+
+    for name, metadata in tileset_metadata.items():
+        tilesets_info[name] = {
+            "source_type": metadata["source_type"],
+            "source_path": metadata["source_path"],
+            "tile_count": metadata["tile_count"],
+            "tile_count_complete": metadata.get("tile_count_complete", True),
+            "zoom_levels": metadata["zoom_levels"],
+            "sample_tiles": metadata["sample_tiles"][:3],
+            "scanned_at": metadata.get("scanned_at"),
+        }
+        total_tiles += metadata["tile_count"]
+
+    info = {
+        "service": "Multi-Tileset Event Tile Server",
+        "version": "2.5.0-event",
+        "environment": "local-event",
+        "tilesets": tilesets_info,
+        "total_tiles": f"{total_tiles:,}",
+        "health_check_url": "/health",
+        "tileset_detail_url": "/tilesets/{tileset_name}",
+        "tile_url_format": "/{tileset_name}/{z}/{x}/{y.ext}",
+        "admin_endpoints": {
+            "rebuild_tar_index": "/admin/rebuild/{tileset_name}",
+            "tar_index_status": "/admin/status/{tileset_name}",
+        },
+        "optimizations": [
+            "Multi-worker tile serving via Uvicorn",
+            "Thread-safe tar archive access with async locks",
+            "Multiple tileset support with independent caching",
+            "Support for directory and tar archive sources",
+            "Tar archive streaming (no disk extraction required)",
+            "Hot index rebuild without server restart",
+            "Aggressive client-side caching for looping displays",
+            "Local network optimization",
+            "Event stability features",
+            "Optional pre-scanned tile metadata on startup",
+        ],
+        "note": "Optimized for local event deployment with zoom levels 1-25. Supports both directory and tar archive tile sources.",
+    }
+    return orjson.dumps(info)
+
 
 def _compute_sentinel_path(config_path: str) -> Path:
     """Return a stable per-config sentinel path, writable by all workers."""
@@ -62,6 +230,14 @@ def _compute_sentinel_path(config_path: str) -> Path:
     return Path(tempfile.gettempdir()) / f".tar_reload_{config_hash}"
 
 
+def _worker_log_level(event_mode: bool) -> int:
+    """Return the worker log level: TILE_LOG_LEVEL if valid, else by server mode."""
+    level = getattr(logging, os.getenv("TILE_LOG_LEVEL", "").upper(), None)
+    if isinstance(level, int):
+        return level
+    return logging.WARNING if event_mode else logging.INFO
+
+
 def create_app(
     config_path: str,
     do_scan: bool = True,
@@ -85,7 +261,7 @@ def create_app(
     # Configure logging for worker processes (basicConfig is idempotent)
     pid = os.getpid()
     logging.basicConfig(
-        level=logging.INFO,
+        level=_worker_log_level(event_mode),
         format=f"%(levelname)s:\t[WORKER {pid}] %(message)s",
     )
 
@@ -93,8 +269,8 @@ def create_app(
     pre_scanned_metadata = None
     if metadata_file and os.path.exists(metadata_file):
         try:
-            with open(metadata_file, "r") as f:
-                pre_scanned_metadata = json.load(f)
+            # One read plus orjson's C parser; every worker pays this at startup
+            pre_scanned_metadata = orjson.loads(Path(metadata_file).read_bytes())
             logger.info("Loaded pre-scanned metadata from MAIN process")
         except Exception as e:
             logger.warning("Failed to load pre-scanned metadata: %s", e)
@@ -107,13 +283,30 @@ def create_app(
         logger.error("Configuration error: %s", e)
         raise
 
+    server_mode = "event-optimized" if event_mode else "development"
+    # Bound by lifespan and read by get_tile as closure variables, so the hot
+    # path skips Starlette's State.__getattr__. TarManager is created inside
+    # lifespan because its asyncio.Lock must belong to the serving loop.
+    tar_manager: Optional[TarManager] = None
+    tile_routes: Dict[str, TileRoute] = {}
+    directory_headers: Dict[str, Dict[str, str]] = {}
+    tile_executor: Optional[ThreadPoolExecutor] = None
+
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        nonlocal tar_manager, tile_routes, directory_headers, tile_executor
         # Startup
         logger.info("Event tile server starting with %d tilesets", len(tilesets))
 
-        server_mode = "event-optimized" if event_mode else "development"
+        anyio.to_thread.current_default_thread_limiter().total_tokens = (
+            BLOCKING_IO_THREADS
+        )
+        tile_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("TILE_IO_THREADS", DIRECTORY_IO_THREADS)),
+            thread_name_prefix="tile-io",
+        )
         tar_manager = TarManager()
+        tar_manager.on_index_swap = tile_cache.invalidate
         tileset_metadata: dict = {}
 
         # Initialize tar tilesets: builds the index needed for serving and yields
@@ -196,74 +389,24 @@ def create_app(
             )
         else:
             # Directory tilesets: scan (or use defaults), tar metadata already set above.
-            for tileset_name, tileset_info in tilesets.items():
-                if tileset_info["source_type"] != "directory":
-                    continue
-
-                source_path = tileset_info["source_path"]
-
-                if do_scan:
-                    logger.info("Scanning directory tileset '%s'...", tileset_name)
-                    try:
-                        (
-                            tile_count,
-                            sample_tiles,
-                            zoom_levels,
-                            min_zoom,
-                            max_zoom,
-                            scan_complete,
-                        ) = await asyncio.to_thread(
-                            scan_tiles,
-                            source_path=source_path,
-                            source_type="directory",
-                        )
-                        tileset_metadata[tileset_name] = {
-                            "source_path": str(source_path),
-                            "source_type": "directory",
-                            "base_path": "",
-                            "tile_count": tile_count,
-                            "tile_count_complete": scan_complete,
-                            "sample_tiles": [
-                                f"/{tileset_name}/{t}" for t in sample_tiles
-                            ],
-                            "zoom_levels": zoom_levels,
-                            "min_zoom": min_zoom,
-                            "max_zoom": max_zoom,
-                            "scanned_at": datetime.datetime.now().isoformat(),
-                        }
-                        if zoom_levels:
-                            logger.info(
-                                "Tileset '%s': %d tiles, zoom %d-%d",
-                                tileset_name,
-                                tile_count,
-                                min_zoom,
-                                max_zoom,
-                            )
-                        else:
-                            logger.info(
-                                "Tileset '%s': %d tiles, no zoom structure detected",
-                                tileset_name,
-                                tile_count,
-                            )
-                    except Exception as e:
-                        logger.error(
-                            "Error scanning directory tileset '%s': %s", tileset_name, e
-                        )
-                        tileset_metadata[tileset_name] = {
-                            "source_path": str(source_path),
-                            "source_type": "directory",
-                            "base_path": "",
-                            "tile_count": 0,
-                            "tile_count_complete": False,
-                            "sample_tiles": [],
-                            "zoom_levels": [],
-                            "min_zoom": DEFAULT_MIN_Z,
-                            "max_zoom": DEFAULT_MAX_Z,
-                            "scanned_at": datetime.datetime.now().isoformat(),
-                        }
-                else:
+            directory_names = [
+                name
+                for name, info in tilesets.items()
+                if info["source_type"] == "directory"
+            ]
+            if do_scan:
+                # Scans are independent; walk the trees side by side
+                scanned = await asyncio.gather(
+                    *(
+                        _scan_directory_tileset(name, tilesets[name]["source_path"])
+                        for name in directory_names
+                    )
+                )
+                tileset_metadata.update(zip(directory_names, scanned))
+            else:
+                for tileset_name in directory_names:
                     tileset_metadata[tileset_name] = {
-                        "source_path": str(source_path),
+                        "source_path": str(tilesets[tileset_name]["source_path"]),
                         "source_type": "directory",
                         "base_path": "",
                         "tile_count": 0,
@@ -277,8 +420,35 @@ def create_app(
 
         app.state.tilesets = tilesets
         app.state.tileset_metadata = tileset_metadata
+        app.state.root_body = _root_body(tileset_metadata)
+        # Flat per-tileset routing row so get_tile does one dict lookup;
+        # /admin/rescan refreshes a row when it changes the zoom bounds.
+        tile_routes = {
+            name: _tile_route(tilesets[name], metadata)
+            for name, metadata in tileset_metadata.items()
+            if name in tilesets
+        }
+        app.state.tile_routes = tile_routes
+        # Constant per-tileset response headers for directory tiles; get_tile
+        # copies the dict and adds only ETag and Last-Modified per request.
+        directory_headers = {}
+        for name, info in tilesets.items():
+            if info["source_type"] != "directory":
+                continue
+            headers = {
+                "Cache-Control": TILE_CACHE_CONTROL,
+                "X-Tile-Server": server_mode,
+                "X-Tileset": name,
+                "X-Source-Type": "directory",
+            }
+            if server_mode == "event-optimized":
+                headers["X-Cache-Strategy"] = "local-event"
+            directory_headers[name] = headers
+        app.state.directory_headers = directory_headers
         app.state.tar_manager = tar_manager
         app.state.server_mode = server_mode
+        app.state.tile_cache = tile_cache
+        app.state.etag_cache = etag_cache
 
         logger.info("Event tile server ready for displays!")
         try:
@@ -287,14 +457,29 @@ def create_app(
             # Shutdown
             logger.info("Event tile server shutting down...")
             await tar_manager.close_all()
+            tile_executor.shutdown(wait=False)
 
     app = FastAPI(
         title="Multi-Tileset Event Tile Server",
         description="High-performance tile server with multiple tileset support, optimized for local events",
         version="2.5.0-event",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
+    # Hot tile cache sits innermost so cached responses still get CORS and
+    # security headers applied per request.
+    tile_cache = TileCache(
+        max_bytes=int(os.getenv("TILE_LRU_BYTES", DEFAULT_TILE_CACHE_BYTES))
+    )
+    # A zero budget disables the cache: skip the middleware, which would
+    # otherwise still buffer every GET response body
+    if tile_cache.max_bytes > 0:
+        app.add_middleware(TileCacheMiddleware, cache=tile_cache)
+    # Directory tiles are not in tile_cache; remembering their recent ETags
+    # still lets conditional requests skip the filesystem.
+    etag_cache = EtagCache()
+
     # Security + CORS
     # WARNING: This permissive CORS configuration (`allow_origins=["*"]`) is suitable only for
     # internal networks and local development. If this server were to be exposed to the
@@ -308,25 +493,22 @@ def create_app(
         allow_headers=["*"],
     )
 
-    @app.middleware("http")
-    async def security_headers(request: Request, call_next):
-        response = await call_next(request)
-        response.headers.setdefault("X-Content-Type-Options", "nosniff")
-        response.headers.setdefault("Referrer-Policy", "no-referrer")
-        return response
+    app.add_middleware(SecurityHeadersMiddleware)
 
     # Custom exception handler for TileServerError
     @app.exception_handler(TileServerError)
     async def tile_server_error_handler(request: Request, exc: TileServerError):
         error_code = exc.error_code or "INTERNAL_ERROR"
-        logger.warning("%s - %s [%s]", error_code, exc.message, request.url.path)
-        return JSONResponse(
+        # The raw ASGI path, so 404s don't build and parse a full request.url
+        path = request.scope["path"]
+        # Missing tiles are routine on sparse tilesets; under load a WARNING
+        # line per 404 would cost more than serving it. Event-mode workers
+        # log at WARNING, so only server-side failures reach their logs.
+        level = logging.WARNING if exc.status_code >= 500 else logging.INFO
+        logger.log(level, "%s - %s [%s]", error_code, exc.message, path)
+        return ORJSONResponse(
             status_code=exc.status_code,
-            content={
-                "error": error_code,
-                "message": exc.message,
-                "path": str(request.url.path),
-            },
+            content={"error": error_code, "message": exc.message, "path": path},
         )
 
     @app.get("/health", summary="Health check endpoint")
@@ -339,48 +521,10 @@ def create_app(
 
     @app.get("/", summary="Server information and status")
     async def root(request: Request):
-        tilesets_info = {}
-        total_tiles = 0
-
-        for name, metadata in request.app.state.tileset_metadata.items():
-            tilesets_info[name] = {
-                "source_type": metadata["source_type"],
-                "source_path": metadata["source_path"],
-                "tile_count": metadata["tile_count"],
-                "tile_count_complete": metadata.get("tile_count_complete", True),
-                "zoom_levels": metadata["zoom_levels"],
-                "sample_tiles": metadata["sample_tiles"][:3],
-                "scanned_at": metadata.get("scanned_at"),
-            }
-            total_tiles += metadata["tile_count"]
-
-        return {
-            "service": "Multi-Tileset Event Tile Server",
-            "version": "2.5.0-event",
-            "environment": "local-event",
-            "tilesets": tilesets_info,
-            "total_tiles": f"{total_tiles:,}",
-            "health_check_url": "/health",
-            "tileset_detail_url": "/tilesets/{tileset_name}",
-            "tile_url_format": "/{tileset_name}/{z}/{x}/{y.ext}",
-            "admin_endpoints": {
-                "rebuild_tar_index": "/admin/rebuild/{tileset_name}",
-                "tar_index_status": "/admin/status/{tileset_name}",
-            },
-            "optimizations": [
-                "Multi-worker tile serving via Uvicorn",
-                "Thread-safe tar archive access with async locks",
-                "Multiple tileset support with independent caching",
-                "Support for directory and tar archive sources",
-                "Tar archive streaming (no disk extraction required)",
-                "Hot index rebuild without server restart",
-                "Aggressive client-side caching for looping displays",
-                "Local network optimization",
-                "Event stability features",
-                "Optional pre-scanned tile metadata on startup",
-            ],
-            "note": "Optimized for local event deployment with zoom levels 1-25. Supports both directory and tar archive tile sources.",
-        }
+        # Pre-rendered in lifespan and refreshed by /admin/rescan
+        return Response(
+            content=request.app.state.root_body, media_type="application/json"
+        )
 
     @app.get(
         "/tilesets/{tileset_name}",
@@ -518,7 +662,8 @@ def create_app(
                 raise HTTPException(status_code=500, detail=f"Rescan failed: {str(e)}")
             sample_tiles = [f"/{tileset_name}/{t}" for t in raw_samples]
 
-        request.app.state.tileset_metadata[tileset_name].update(
+        metadata = request.app.state.tileset_metadata[tileset_name]
+        metadata.update(
             {
                 "tile_count": tile_count,
                 "tile_count_complete": scan_complete,
@@ -529,6 +674,11 @@ def create_app(
                 "scanned_at": scanned_at,
             }
         )
+        request.app.state.tile_routes[tileset_name] = _tile_route(
+            tileset_info, metadata
+        )
+        request.app.state.etag_cache.invalidate(tileset_name)
+        request.app.state.root_body = _root_body(request.app.state.tileset_metadata)
 
         return {
             "status": "success",
@@ -570,106 +720,151 @@ def create_app(
             **tar_manager.index_status[tileset_name],
         }
 
-    @app.get(
-        "/{tileset_name}/{z}/{x}/{y:path}",
-        summary="Serve a single map tile from specified tileset",
-    )
-    async def get_tile(tileset_name: str, z: int, x: int, y: str, request: Request):
+    async def get_tile(request: Request) -> Response:
         """
         Serves an individual tile file (e.g., .png, .jpg) from a specific tileset
         based on Z/X/Y coordinates.
 
+        Registered as a plain Starlette route (below), so tile requests skip
+        FastAPI's per-request dependency solving and parameter validation.
+
         Validation:
           - tileset_name must be a configured tileset
+          - z and x must be integers
           - z must be within [min_zoom, max_zoom]
           - x must be within [0, 2^z - 1]
           - y filename is sanitized and validated
         """
+        path_params = request.path_params
+        tileset_name = path_params["tileset_name"]
+        y = path_params["y"]
+        try:
+            z = int(path_params["z"])
+            x = int(path_params["x"])
+        except ValueError:
+            raise HTTPException(
+                status_code=422,
+                detail="Invalid tile coordinates: z and x must be integers.",
+            )
+
         # Validate tileset exists
-        if tileset_name not in request.app.state.tilesets:
-            available = list(request.app.state.tilesets.keys())
+        route = tile_routes.get(tileset_name)
+        if route is None:
+            available = list(tilesets.keys())
             raise TilesetNotFoundError(tileset_name, available)
 
-        metadata = request.app.state.tileset_metadata[tileset_name]
-        min_allowed_z = metadata["min_zoom"]
-        max_allowed_z = metadata["max_zoom"]
+        min_allowed_z = route.min_zoom
+        max_allowed_z = route.max_zoom
 
         # Validate zoom level
         if not (min_allowed_z <= z <= max_allowed_z):
             raise InvalidZoomLevelError(z, min_allowed_z, max_allowed_z, tileset_name)
 
+        bound = _ZOOM_BOUNDS[z] if z < len(_ZOOM_BOUNDS) else 1 << z
+
         # Validate X coordinate
-        if not (0 <= x < (1 << z)):
+        if not (0 <= x < bound):
             raise InvalidCoordinateError("X", x, z)
 
-        # Sanitize Y: ensure no directory traversal
-        y_name = Path(y).name
-        if y_name != y:
+        # Sanitize Y: ensure no directory traversal (plain string checks,
+        # no PurePath construction on the hot path). A leading dot covers "."
+        # and ".."; inner dots as in "1..png" are part of a valid filename.
+        if not y or y.startswith(".") or "/" in y or "\\" in y:
             raise HTTPException(
                 status_code=400,
                 detail="Invalid Y coordinate format. Must be a filename (no path components).",
             )
+        y_name = y
 
         # Validate Y coordinate if numeric
-        stem = Path(y_name).stem
+        stem = split_y_name(y_name)[0]
         if stem.isdigit():
             y_int = int(stem)
-            if not (0 <= y_int < (1 << z)):
+            if not (0 <= y_int < bound):
                 raise InvalidCoordinateError("Y", y_int, z)
 
-        tileset_info = request.app.state.tilesets[tileset_name]
-        source_type = tileset_info["source_type"]
+        source_type = route.source_type
 
         if source_type == "directory":
             # Directory-based serving
-            base_dir = tileset_info["source_path"]
+            base_dir = route.source_path
 
-            # Run sync file operations in thread pool to avoid blocking event loop
-            tile_path, tried_extensions = await asyncio.to_thread(
-                find_tile_path, base_dir, z, x, y_name
+            if_none_match = request.headers.get("If-None-Match")
+            # Only consulted without If-None-Match (RFC 9110 13.2.2)
+            if_modified_since = (
+                None if if_none_match else request.headers.get("If-Modified-Since")
             )
+            etag_key = (tileset_name, z, x, y_name)
+            if if_none_match:
+                cached_etag = etag_cache.get(etag_key)
+                if cached_etag and etag_matches(if_none_match, cached_etag):
+                    return Response(
+                        status_code=304,
+                        headers={
+                            "ETag": cached_etag,
+                            "Cache-Control": TILE_CACHE_CONTROL,
+                        },
+                    )
 
-            if not tile_path:
-                raise TileNotFoundError(tileset_name, z, x, y_name, tried_extensions)
-
-            # Verify file is readable (in thread pool)
+            # Probe, stat and (for normal-sized tiles) read in one hop to the
+            # tile-io pool
             try:
-                st = await asyncio.to_thread(tile_path.stat)
-            except Exception as e:
+                (
+                    tile_path,
+                    st,
+                    tile_data,
+                    tried_extensions,
+                ) = await asyncio.get_running_loop().run_in_executor(
+                    tile_executor,
+                    read_tile_file,
+                    base_dir,
+                    z,
+                    x,
+                    y_name,
+                    MAX_INLINE_TILE_SIZE,
+                    if_none_match,
+                    if_modified_since,
+                )
+            except OSError as e:
                 raise TileCorruptedError(
-                    tileset_name, z, x, y_name, f"Cannot stat file: {str(e)}"
+                    tileset_name, z, x, y_name, f"Cannot read file: {str(e)}"
                 )
 
-            etag = f'W/"{st.st_mtime_ns}-{st.st_size}"'
+            if tile_path is None or st is None:
+                raise TileNotFoundError(tileset_name, z, x, y_name, tried_extensions)
+
+            etag = weak_etag(st.st_mtime_ns, st.st_size)
+            etag_cache.put(etag_key, etag)
+            mtime = st.st_mtime_ns // 1_000_000_000
 
             # Check for conditional request (304 Not Modified)
-            if_none_match = request.headers.get("If-None-Match")
-            if if_none_match and if_none_match == etag:
+            if is_not_modified(if_none_match, if_modified_since, etag, mtime):
+                # Fresh dict per response: Response objects are mutable, so
+                # a cached 304 could leak headers between requests.
                 return Response(
                     status_code=304,
-                    headers={
-                        "ETag": etag,
-                        "Cache-Control": "public, max-age=86400, immutable",
-                    },
+                    headers={"ETag": etag, "Cache-Control": TILE_CACHE_CONTROL},
                 )
 
-            server_mode = request.app.state.server_mode
-            headers = {
-                "Cache-Control": "public, max-age=86400, immutable",
-                "ETag": etag,
-                "Last-Modified": email.utils.formatdate(st.st_mtime, usegmt=True),
-                "X-Tile-Server": server_mode,
-                "X-Tileset": tileset_name,
-                "X-Source-Type": "directory",
-            }
-            if server_mode == "event-optimized":
-                headers["X-Cache-Strategy"] = "local-event"
+            headers = directory_headers[tileset_name].copy()
+            headers["ETag"] = etag
+            headers["Last-Modified"] = http_date(mtime)
 
-            media_type = media_type_for_suffix(tile_path.suffix)
+            media_type = MEDIA_TYPES.get(tile_path.suffix.lower(), DEFAULT_MEDIA_TYPE)
+
+            if tile_data is not None:
+                return Response(
+                    content=tile_data, media_type=media_type, headers=headers
+                )
 
             try:
+                # Oversized tile: stream it, reusing the probe's stat so
+                # FileResponse skips its own os.stat thread-pool hop.
                 return FileResponse(
-                    path=tile_path, headers=headers, media_type=media_type
+                    path=tile_path,
+                    headers=headers,
+                    media_type=media_type,
+                    stat_result=st,
                 )
             except Exception as e:
                 raise TileCorruptedError(
@@ -678,15 +873,21 @@ def create_app(
 
         elif source_type == "tar":
             # Tar archive-based serving
-            tar_manager = request.app.state.tar_manager
             if_none_match = request.headers.get("If-None-Match")
+            if_modified_since = (
+                None if if_none_match else request.headers.get("If-Modified-Since")
+            )
 
             try:
                 tile_data, media_type, headers = await tar_manager.get_tile_from_tar(
-                    tileset_name, z, x, y_name, if_none_match=if_none_match
+                    tileset_name,
+                    z,
+                    x,
+                    y_name,
+                    if_none_match=if_none_match,
+                    if_modified_since=if_modified_since,
                 )
 
-                server_mode = request.app.state.server_mode
                 headers["X-Tile-Server"] = server_mode
                 if server_mode == "event-optimized":
                     headers["X-Cache-Strategy"] = "local-event"
@@ -695,10 +896,10 @@ def create_app(
                 if tile_data is None:
                     return Response(status_code=304, headers=headers)
 
-                return StreamingResponse(
-                    BytesIO(tile_data),
-                    media_type=media_type,
-                    headers=headers,
+                # The tile is already in memory: one body message, with
+                # Content-Length, instead of a chunked stream.
+                return Response(
+                    content=tile_data, media_type=media_type, headers=headers
                 )
 
             except TileServerError:
@@ -706,8 +907,8 @@ def create_app(
                 raise
             except Exception as e:
                 # Catch any unexpected errors
-                logger.error(
-                    "Unexpected error serving tile from tar: %s", e, exc_info=True
+                logger.exception(
+                    "Unexpected error serving tile from tar tileset '%s'", tileset_name
                 )
                 raise TileCorruptedError(
                     tileset_name, z, x, y_name, f"Unexpected error: {str(e)}"
@@ -719,6 +920,11 @@ def create_app(
                 detail=f"Unknown source type: {source_type}",
             )
 
+    # Registered last, like the decorator routes, so it cannot shadow them
+    app.router.routes.append(
+        Route("/{tileset_name}/{z}/{x}/{y:path}", get_tile, methods=["GET"])
+    )
+
     return app
 
 
@@ -730,6 +936,8 @@ def get_app() -> FastAPI:
         CONFIG_PATH: Path to tileset config file (default: 'config.json').
         TILE_SCAN: '1' to enable startup scan (default), '0' to disable.
         TILE_METADATA_FILE: Path to pre-scanned metadata (from MAIN process).
+        TILE_LOG_LEVEL: Worker log level (default: WARNING in event mode,
+            otherwise INFO).
 
     Returns:
         Configured FastAPI application instance.
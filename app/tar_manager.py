@@ -1,33 +1,44 @@
-"""Tar archive index management and mmap-based tile extraction."""
+"""Tar archive index management and pread-based tile extraction."""
 
 import asyncio
 import datetime
-import email.utils
 import logging
-import mmap
 import os
 import pickle
-import tarfile
+import sys
 import tempfile
 from pathlib import Path
-from typing import IO, Any, Dict, List, Optional, Set, Tuple
+from typing import IO, Any, Callable, Dict, List, Optional, Set, Tuple
 
 from app.exceptions import (
     TarIndexUnavailableError,
     TileCorruptedError,
     TileNotFoundError,
 )
+from app.tar_reader import read_tile
 from app.utils import (
+    DEFAULT_MEDIA_TYPE,
+    MEDIA_TYPES,
+    TILE_CACHE_CONTROL,
     TileEntry,
+    detect_tar_compression,
     find_tile_in_tar_index,
-    media_type_for_suffix,
+    http_date,
+    is_not_modified,
+    iter_tar_members,
     parse_tile_member_path,
+    scan_tar_file_entries,
+    tar_open_mode,
+    weak_etag,
 )
 
 logger = logging.getLogger("event_tile_server")
 
 _MAX_SAMPLE_TILES = 5
 
+# Seconds a swapped-out tar handle stays open for reads already in flight
+HANDLE_RELEASE_DELAY = 30.0
+
 
 def _touch_sentinel(sentinel_path: Path) -> None:
     """Touch the reload sentinel file so other workers detect a fresh index."""
@@ -60,22 +71,46 @@ def get_tar_cache_path(tar_path: Path) -> Path:
     return Path(tempfile.gettempdir()) / f"{tar_path.name}.idx"
 
 
+def _build_index_with_tarfile(tar_path: Path) -> Dict[str, TileEntry]:
+    """Index every file member through tarfile (compressed or unusual archives)."""
+    import tarfile  # deferred: directory-only deployments never need it
+
+    unified_index: Dict[str, TileEntry] = {}
+    with tarfile.open(tar_path, tar_open_mode(tar_path)) as tar:
+        for member in iter_tar_members(tar):
+            if not member.isfile():
+                continue
+            unified_index[member.name] = TileEntry(
+                offset=member.offset_data,
+                size=member.size,
+                mtime=member.mtime,
+                suffix=sys.intern(Path(member.name).suffix.lower()),
+            )
+    return unified_index
+
+
 def build_unified_tar_index(tar_path: Path) -> Dict[str, TileEntry]:
-    """Build a unified index of all tile members in a tar archive."""
+    """
+    Build a unified index of all tile members in a tar archive.
+
+    Uncompressed archives are indexed by parsing their headers directly,
+    which avoids a TarInfo object per member; archives that parser rejects
+    (sparse members, global pax headers, damage) are retried with tarfile.
+    """
     unified_index: Dict[str, TileEntry] = {}
     try:
-        # "r:*" accepts any compression, but compressed tars are rejected at
-        # config-load time, so only uncompressed archives reach this point.
-        with tarfile.open(tar_path, "r:*") as tar:
-            for member in tar:
-                if not member.isfile():
-                    continue
-                unified_index[member.name] = TileEntry(
-                    offset=member.offset_data,
-                    size=member.size,
-                    mtime=member.mtime,
-                    suffix=Path(member.name).suffix.lower(),
+        if detect_tar_compression(tar_path) == "uncompressed":
+            try:
+                unified_index = dict(scan_tar_file_entries(tar_path))
+            except ValueError as e:
+                logger.debug(
+                    "Header scan of %s failed (%s); retrying with tarfile",
+                    tar_path.name,
+                    e,
                 )
+                unified_index = _build_index_with_tarfile(tar_path)
+        else:
+            unified_index = _build_index_with_tarfile(tar_path)
         logger.debug(
             "Built unified tar index for %s: %d total files",
             tar_path.name,
@@ -115,35 +150,66 @@ def filter_index_for_tileset(
     return member_index, zoom_levels, sample_tiles
 
 
+def _tar_stamp(tar_path: Path) -> Tuple[int, int]:
+    """Return the (mtime_ns, size) pair that keys a tar's cached index."""
+    st = tar_path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def load_cached_tar_index(tar_path: Path) -> Optional[Dict[str, TileEntry]]:
+    """
+    Load the unified index from its .idx cache without touching the archive.
+
+    The cache is valid only if it is at least as new as the tar and its stored
+    (mtime_ns, size) stamp matches the tar on disk.
+
+    Returns:
+        The cached unified index, or None if the cache is missing or stale.
+    """
+    cache_path = get_tar_cache_path(tar_path)
+    if not cache_path.exists():
+        return None
+    try:
+        if cache_path.stat().st_mtime < tar_path.stat().st_mtime:
+            return None
+        logger.debug(
+            "Loading tar index cache for %s from %s", tar_path.name, cache_path
+        )
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+        # Caches written before stamping stored the bare dict; treat as stale.
+        if not isinstance(cached, tuple) or len(cached) != 2:
+            return None
+        stamp, unified_index = cached
+        if stamp != _tar_stamp(tar_path):
+            return None
+        return unified_index
+    except Exception as e:
+        logger.warning(
+            "Error checking/loading tar index cache for %s: %s", tar_path.name, e
+        )
+    return None
+
+
 def load_or_build_tar_index(
     tar_path: Path, force_rebuild: bool = False
 ) -> Dict[str, TileEntry]:
     """Load the unified index from cache if valid, otherwise build and cache it."""
     cache_path = get_tar_cache_path(tar_path)
 
-    if not force_rebuild and cache_path.exists():
-        try:
-            tar_mtime = tar_path.stat().st_mtime
-            cache_mtime = cache_path.stat().st_mtime
-            if cache_mtime >= tar_mtime:
-                logger.debug(
-                    "Loading tar index cache for %s from %s", tar_path.name, cache_path
-                )
-                with open(cache_path, "rb") as f:
-                    unified_index = pickle.load(f)
-                return unified_index
-        except Exception as e:
-            logger.warning(
-                "Error checking/loading tar index cache for %s: %s", tar_path.name, e
-            )
+    if not force_rebuild:
+        cached_index = load_cached_tar_index(tar_path)
+        if cached_index is not None:
+            return cached_index
 
     logger.info("Building unified tar index for %s...", tar_path.name)
+    stamp = _tar_stamp(tar_path)
     unified_index = build_unified_tar_index(tar_path)
 
     try:
         temp_cache = cache_path.with_suffix(".tmp")
         with open(temp_cache, "wb") as f:
-            pickle.dump(unified_index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump((stamp, unified_index), f, protocol=pickle.HIGHEST_PROTOCOL)
         os.replace(temp_cache, cache_path)
         logger.debug("Saved tar index cache to %s", cache_path)
     except Exception as e:
@@ -172,24 +238,29 @@ def build_tar_index(
 
 class TarManager:
     """
-    Manager for tar file indexes with mmap-based tile extraction.
+    Manager for tar file indexes with pread-based tile extraction.
 
-    On initialization each tileset's tar file is memory-mapped (one file descriptor
-    per tileset per worker). Tile reads are synchronous slices of the mmap — O(1)
-    seek, no per-request FD open/close, no thread pool required.
+    On initialization each tileset's tar file is opened once (one file descriptor
+    per archive per worker, shared by tilesets backed by the same tar). Tile reads are positioned reads on the tar-io thread
+    pool — no per-request FD open/close, and a cold read never blocks the loop.
 
     Attributes:
         rebuild_lock: Prevents concurrent index rebuilds.
         tar_indexes: Pre-built indexes mapping tile paths to TileEntry objects.
-        mmaps: Memory-mapped views of each tileset's tar file.
+        tar_files: Open read handle of each tileset's tar file. Tilesets backed
+            by the same archive share one handle.
         index_status: Tracks index state per tileset (ready, rebuilding, error).
+        on_index_swap: Optional callback invoked with the tileset name whenever
+            a rebuilt or reloaded index replaces the live one.
     """
 
     def __init__(self) -> None:
         self.rebuild_lock: asyncio.Lock = asyncio.Lock()
         self.tar_indexes: Dict[str, Dict[str, TileEntry]] = {}
-        self.mmaps: Dict[str, mmap.mmap] = {}
-        self._mmap_files: Dict[str, IO[bytes]] = {}
+        self.tar_files: Dict[str, IO[bytes]] = {}
+        # Shared handles keyed by (st_dev, st_ino) with their reference counts
+        self._shared_files: Dict[Tuple[int, int], IO[bytes]] = {}
+        self._file_refs: Dict[Tuple[int, int], int] = {}
         self.index_status: Dict[str, Dict[str, Any]] = {}
         # Sentinel-based cross-worker reload
         self._tileset_sources: Dict[str, Tuple[Path, str]] = {}
@@ -198,6 +269,59 @@ class TarManager:
         self._sentinel_mtime: float = 0.0
         self._sentinel_task: Optional[asyncio.Task] = None
         self._sentinel_poll_interval: float = 2.0  # override in tests
+        self._handle_release_delay: float = HANDLE_RELEASE_DELAY  # override in tests
+        self.on_index_swap: Optional[Callable[[str], None]] = None
+
+    def _acquire_tar_file(self, source_path: Path) -> IO[bytes]:
+        """
+        Return a long-lived read handle for a tar archive, sharing open files.
+
+        Handles are keyed by the file's identity rather than its path, so an
+        archive replaced on disk gets a fresh handle while tilesets still on
+        the old index keep reading the old file.
+
+        Args:
+            source_path: Path to the tar archive.
+
+        Returns:
+            Open binary handle; release it with _release_tar_file.
+        """
+        fh: IO[bytes] = open(source_path, "rb")
+        st = os.fstat(fh.fileno())
+        key = (st.st_dev, st.st_ino)
+        shared = self._shared_files.get(key)
+        if shared is not None:
+            fh.close()
+            self._file_refs[key] += 1
+            return shared
+        self._shared_files[key] = fh
+        self._file_refs[key] = 1
+        return fh
+
+    def _release_tar_file(self, fh: IO[bytes]) -> None:
+        """Drop one reference to a shared handle, closing it on the last one."""
+        if fh.closed:  # close_all already ran
+            return
+        st = os.fstat(fh.fileno())
+        key = (st.st_dev, st.st_ino)
+        self._file_refs[key] -= 1
+        if self._file_refs[key] == 0:
+            del self._file_refs[key]
+            del self._shared_files[key]
+            fh.close()
+
+    def _retire_tar_file(self, fh: IO[bytes]) -> None:
+        """
+        Release a handle that was just swapped out, once in-flight reads are done.
+
+        Readers pick up the handle before awaiting their pread, so a request
+        that started before the swap may still be reading the old file.
+        Closing it at once would fail that read, or worse, let the fd number
+        be reused by another file before the pread runs.
+        """
+        asyncio.get_running_loop().call_later(
+            self._handle_release_delay, self._release_tar_file, fh
+        )
 
     async def initialize_tileset(
         self, tileset_name: str, source_path: Path, base_path: str = ""
@@ -228,11 +352,9 @@ class TarManager:
                 )
 
                 zoom_levels_sorted = sorted(zoom_levels)
-                fh: IO[bytes] = open(source_path, "rb")
-                mmap_obj = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                fh = self._acquire_tar_file(source_path)
                 self.tar_indexes[tileset_name] = member_index
-                self.mmaps[tileset_name] = mmap_obj
-                self._mmap_files[tileset_name] = fh
+                self.tar_files[tileset_name] = fh
                 self.index_status[tileset_name] = {
                     "status": "ready",
                     "tile_count": len(member_index),
@@ -293,15 +415,11 @@ class TarManager:
                 )
 
                 zoom_levels_sorted = sorted(zoom_levels)
-                new_fh: IO[bytes] = open(source_path, "rb")
-                new_mmap = mmap.mmap(new_fh.fileno(), 0, access=mmap.ACCESS_READ)
-
-                old_mmap = self.mmaps.get(tileset_name)
-                old_fh = self._mmap_files.get(tileset_name)
+                new_fh = self._acquire_tar_file(source_path)
+                old_fh = self.tar_files.get(tileset_name)
 
                 self.tar_indexes[tileset_name] = new_index
-                self.mmaps[tileset_name] = new_mmap
-                self._mmap_files[tileset_name] = new_fh
+                self.tar_files[tileset_name] = new_fh
                 self.index_status[tileset_name] = {
                     "status": "ready",
                     "tile_count": len(new_index),
@@ -309,12 +427,13 @@ class TarManager:
                     "last_rebuilt": datetime.datetime.now().isoformat(),
                 }
 
-                # Close old mmap after swap — no await between swap and close,
-                # so no other coroutine can observe a half-replaced state.
-                if old_mmap:
-                    old_mmap.close()
+                # No await between the assignments above, so no other coroutine
+                # can observe a half-replaced state; the old handle outlives
+                # reads that fetched it before the swap.
                 if old_fh:
-                    old_fh.close()
+                    self._retire_tar_file(old_fh)
+                if self.on_index_swap is not None:
+                    self.on_index_swap(tileset_name)
 
                 # Update our own cache-mtime record before touching the sentinel so
                 # this worker's watcher skips the self-reload.
@@ -349,13 +468,14 @@ class TarManager:
         x: int,
         y_name: str,
         if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None,
     ) -> Tuple[Optional[bytes], str, Dict[str, str]]:
         """
-        Extract a tile from a tar archive via an mmap slice.
+        Extract a tile from a tar archive via a positioned read.
 
         TileEntry.offset is the absolute byte position in the file recorded during
-        indexing. The file is already mmap'd — extraction is a single in-memory
-        slice with no per-request FD open and no thread-pool dispatch required.
+        indexing. The file is already open — extraction is a single os.pread on
+        the tar-io thread pool with no per-request FD open.
 
         Args:
             tileset_name: Name of the tileset.
@@ -363,6 +483,8 @@ class TarManager:
             x: X tile coordinate.
             y_name: Y filename with extension (e.g. "123.png").
             if_none_match: Client ETag for conditional 304 support.
+            if_modified_since: Client date for conditional 304 support; only
+                consulted when there is no If-None-Match.
 
         Returns:
             (tile_data, media_type, headers). tile_data is None for a 304.
@@ -385,46 +507,45 @@ class TarManager:
             )
 
         tar_index = self.tar_indexes.get(tileset_name)
-        mmap_obj = self.mmaps.get(tileset_name)
+        tar_fh = self.tar_files.get(tileset_name)
 
-        if not tar_index or not mmap_obj:
+        if not tar_index or not tar_fh:
             raise TarIndexUnavailableError(tileset_name)
 
         tile_entry, tried_extensions = find_tile_in_tar_index(tar_index, z, x, y_name)
         if not tile_entry:
             raise TileNotFoundError(tileset_name, z, x, y_name, tried_extensions)
 
-        etag = f'W/"{tile_entry.mtime}-{tile_entry.size}"'
-        media_type = (
-            media_type_for_suffix(tile_entry.suffix) or "application/octet-stream"
-        )
+        etag = weak_etag(tile_entry.mtime, tile_entry.size)
+        # TileEntry.suffix is already lowercased at index time
+        media_type = MEDIA_TYPES.get(tile_entry.suffix, DEFAULT_MEDIA_TYPE)
 
-        if if_none_match and if_none_match == etag:
+        if (if_none_match or if_modified_since) and is_not_modified(
+            if_none_match, if_modified_since, etag, int(tile_entry.mtime)
+        ):
             return (
                 None,
                 media_type,
                 {
                     "ETag": etag,
-                    "Cache-Control": "public, max-age=86400, immutable",
+                    "Cache-Control": TILE_CACHE_CONTROL,
                 },
             )
 
         try:
-            tile_data: bytes = mmap_obj[
-                tile_entry.offset : tile_entry.offset + tile_entry.size
-            ]
+            tile_data = await read_tile(tar_fh, tile_entry.offset, tile_entry.size)
         except Exception as e:
             logger.error(
-                "Error reading tile from mmap for tileset '%s': %s", tileset_name, e
+                "Error reading tile from tar for tileset '%s': %s", tileset_name, e
             )
             raise TileCorruptedError(
-                tileset_name, z, x, y_name, f"mmap read failed: {e}"
+                tileset_name, z, x, y_name, f"tar read failed: {e}"
             )
 
         headers = {
-            "Cache-Control": "public, max-age=86400, immutable",
+            "Cache-Control": TILE_CACHE_CONTROL,
             "ETag": etag,
-            "Last-Modified": email.utils.formatdate(tile_entry.mtime, usegmt=True),
+            "Last-Modified": http_date(int(tile_entry.mtime)),
             "X-Tileset": tileset_name,
             "X-Source-Type": "tar",
         }
@@ -432,19 +553,18 @@ class TarManager:
         return tile_data, media_type, headers
 
     async def close_all(self) -> None:
-        """Close all mmap views, file handles, and the sentinel watcher task."""
+        """Close all tar file handles and the sentinel watcher task."""
         if self._sentinel_task is not None and not self._sentinel_task.done():
             self._sentinel_task.cancel()
             try:
                 await self._sentinel_task
             except asyncio.CancelledError:
                 pass
-        for mmap_obj in self.mmaps.values():
-            mmap_obj.close()
-        for fh in self._mmap_files.values():
+        for fh in self._shared_files.values():
             fh.close()
-        self.mmaps.clear()
-        self._mmap_files.clear()
+        self.tar_files.clear()
+        self._shared_files.clear()
+        self._file_refs.clear()
 
     def set_sentinel_path(self, path: Path) -> None:
         """Register the sentinel file path; reads its current mtime as the baseline."""
@@ -497,15 +617,11 @@ class TarManager:
                         build_tar_index, source_path, base_path
                     )
                     zoom_levels_sorted = sorted(zoom_levels)
-                    new_fh: IO[bytes] = open(source_path, "rb")
-                    new_mmap = mmap.mmap(new_fh.fileno(), 0, access=mmap.ACCESS_READ)
-
-                    old_mmap = self.mmaps.get(name)
-                    old_fh = self._mmap_files.get(name)
+                    new_fh = self._acquire_tar_file(source_path)
+                    old_fh = self.tar_files.get(name)
 
                     self.tar_indexes[name] = new_index
-                    self.mmaps[name] = new_mmap
-                    self._mmap_files[name] = new_fh
+                    self.tar_files[name] = new_fh
                     self.index_status[name] = {
                         "status": "ready",
                         "tile_count": len(new_index),
@@ -514,10 +630,10 @@ class TarManager:
                     }
                     self._last_loaded_cache_mtime[name] = cache_mtime
 
-                    if old_mmap:
-                        old_mmap.close()
                     if old_fh:
-                        old_fh.close()
+                        self._retire_tar_file(old_fh)
+                    if self.on_index_swap is not None:
+                        self.on_index_swap(name)
 
                     logger.info(
                         "Auto-reloaded index for tileset '%s': %d tiles",
@@ -0,0 +1,67 @@
+"""Tar tile reads: inline when cached, else on a dedicated thread pool."""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Optional
+
+# Sized for concurrent cold reads; separate from the default executor so
+# directory stats and FileResponse reads do not queue behind tar I/O.
+TAR_IO_THREADS = 16
+
+_TAR_READ_POOL = ThreadPoolExecutor(
+    max_workers=TAR_IO_THREADS, thread_name_prefix="tar-io"
+)
+
+# Tiles up to this size are first tried inline on the event loop, which is
+# cheaper than a pool round trip when the bytes are already in page cache
+INLINE_READ_MAX_SIZE = 64 * 1024
+
+# preadv(RWF_NOWAIT) fails with EAGAIN instead of blocking on disk (Linux 4.14+)
+_HAS_RWF_NOWAIT = hasattr(os, "preadv") and hasattr(os, "RWF_NOWAIT")
+
+
+def _pread_exact(fh: IO[bytes], offset: int, size: int) -> bytes:
+    """Read exactly size bytes at offset without moving the file position."""
+    data = os.pread(fh.fileno(), size, offset)
+    if len(data) != size:
+        raise OSError(f"short read: expected {size} bytes, got {len(data)}")
+    return data
+
+
+def _pread_cached(fh: IO[bytes], offset: int, size: int) -> Optional[bytes]:
+    """Read size bytes at offset only if they are all in page cache, else None."""
+    buf = bytearray(size)
+    try:
+        n = os.preadv(fh.fileno(), [buf], offset, os.RWF_NOWAIT)
+    except OSError:  # EAGAIN when uncached; EOPNOTSUPP on some filesystems
+        return None
+    return bytes(buf) if n == size else None
+
+
+async def read_tile(fh: IO[bytes], offset: int, size: int) -> bytes:
+    """
+    Read a tile's bytes from an open tar file.
+
+    Small tiles already in page cache are read inline with a non-blocking
+    preadv. Everything else goes to the tar-io thread pool, where os.pread
+    releases the GIL while the kernel services the read, so a cold read that
+    has to hit the disk never stalls the event loop.
+
+    Args:
+        fh: Open binary handle of the tar archive.
+        offset: Absolute byte offset of the tile data.
+        size: Length of the tile data in bytes.
+
+    Returns:
+        The tile bytes.
+
+    Raises:
+        OSError: If the read fails or returns fewer bytes than expected.
+    """
+    if _HAS_RWF_NOWAIT and size <= INLINE_READ_MAX_SIZE:
+        data = _pread_cached(fh, offset, size)
+        if data is not None:
+            return data
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_TAR_READ_POOL, _pread_exact, fh, offset, size)
@@ -0,0 +1,317 @@
+"""In-process LRU cache for hot tile responses, installed as ASGI middleware."""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.middleware import ASGIApp, Message, Receive, Scope, Send
+from app.utils import etag_matches, parse_http_date
+
+logger = logging.getLogger("event_tile_server")
+
+DEFAULT_TILE_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_ETAG_CACHE_ENTRIES = 100_000
+# Directory tiles can be replaced on disk, so remembered ETags go stale quickly
+DEFAULT_ETAG_TTL = 5.0
+
+# (tileset_name, z, x, y_name)
+EtagKey = Tuple[str, int, int, str]
+
+# Memory an entry costs beyond its body, header and path bytes: the
+# CachedTile, header tuples and bytes objects, and its OrderedDict slot
+# (measured at ~700 bytes for a tar tile's 10 headers)
+CACHE_ENTRY_OVERHEAD = 768
+
+# Headers dropped when answering a cache hit with 304 Not Modified
+_BODY_HEADERS = frozenset({b"content-length", b"content-type"})
+
+
+class CachedTile:
+    """
+    A complete 200 tile response: raw ASGI headers, body, ETag and mtime.
+
+    ``size`` is what the entry is charged against the cache budget: body and
+    header bytes plus CACHE_ENTRY_OVERHEAD, so even empty tiles cost memory.
+    """
+
+    __slots__ = ("headers", "body", "etag", "mtime", "size")
+
+    def __init__(
+        self,
+        headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+        etag: Optional[bytes],
+        mtime: Optional[int] = None,
+    ) -> None:
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.mtime = mtime
+        self.size = (
+            len(body)
+            + sum(len(name) + len(value) for name, value in headers)
+            + CACHE_ENTRY_OVERHEAD
+        )
+
+
+def _tileset_of(path: str) -> str:
+    """Return the tileset name of a tile request path (/{tileset}/z/x/y)."""
+    return path.split("/", 2)[1] if path.startswith("/") else ""
+
+
+class TileCache:
+    """
+    Byte-bounded LRU of tile responses keyed by request path.
+
+    Looping displays request the same tiles over and over; a hit is answered
+    from memory without routing, validation, or an index lookup.
+
+    Attributes:
+        max_bytes: Upper bound on the total charged size of cached entries
+            (bodies, headers, paths and per-entry overhead).
+        current_bytes: Total charged size of the entries currently cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_TILE_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, CachedTile]" = OrderedDict()
+        # Bumped by invalidate() per tileset and by clear() for all of them
+        self._generations: Dict[str, int] = {}
+        self._clears = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str) -> Optional[CachedTile]:
+        """Return the cached response for a path, marking it most recently used."""
+        entry = self._entries.get(path)
+        if entry is not None:
+            self._entries.move_to_end(path)
+        return entry
+
+    def generation(self, path: str) -> int:
+        """
+        Return the invalidation generation of the tileset a path belongs to.
+
+        Capture it before producing a response and pass it to put(), so a
+        response read from an index that has since been swapped out is not
+        cached after the invalidation that was meant to drop it.
+        """
+        return self._generations.get(_tileset_of(path), 0) + self._clears
+
+    def put(
+        self, path: str, entry: CachedTile, generation: Optional[int] = None
+    ) -> None:
+        """
+        Cache a response, evicting least recently used entries to fit.
+
+        Args:
+            path: Request path the response answers.
+            entry: The complete response.
+            generation: Value of generation(path) taken before the response
+                was produced; the entry is dropped if it no longer matches.
+        """
+        if generation is not None and generation != self.generation(path):
+            return
+        size = entry.size + len(path)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(path, None)
+        if old is not None:
+            self.current_bytes -= old.size + len(path)
+        self._entries[path] = entry
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            evicted_path, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.size + len(evicted_path)
+
+    def invalidate(self, tileset_name: str) -> None:
+        """Drop every cached tile belonging to a tileset (e.g. after a rebuild)."""
+        self._generations[tileset_name] = self._generations.get(tileset_name, 0) + 1
+        prefix = f"/{tileset_name}/"
+        for path in [p for p in self._entries if p.startswith(prefix)]:
+            self.current_bytes -= self._entries.pop(path).size + len(path)
+        logger.debug("Tile cache invalidated for tileset '%s'", tileset_name)
+
+    def clear(self) -> None:
+        """Drop every cached tile."""
+        self._entries.clear()
+        self.current_bytes = 0
+        self._clears += 1
+
+
+class EtagCache:
+    """
+    Bounded, short-lived memo of directory tile ETags keyed by tile.
+
+    Lets a conditional request for a directory tile be answered with 304
+    before the thread-pool hop and stat() calls. Entries expire after ``ttl``
+    seconds, so a tile replaced on disk is picked up within that window.
+
+    Attributes:
+        max_entries: Upper bound on remembered ETags; the oldest go first.
+        ttl: Seconds an ETag is trusted after it was last read from disk.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_ETAG_CACHE_ENTRIES,
+        ttl: float = DEFAULT_ETAG_TTL,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[EtagKey, Tuple[str, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: EtagKey) -> Optional[str]:
+        """Return the remembered ETag for a tile, or None if absent or expired."""
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        if item[1] < time.monotonic():
+            del self._entries[key]
+            return None
+        return item[0]
+
+    def put(self, key: EtagKey, etag: str) -> None:
+        """Remember a tile's ETag as read from disk, evicting the oldest to fit."""
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (etag, time.monotonic() + self.ttl)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tileset_name: str) -> None:
+        """Forget every remembered ETag of a tileset (e.g. after a rescan)."""
+        for key in [k for k in self._entries if k[0] == tileset_name]:
+            del self._entries[key]
+
+
+def _is_tar_response(start_message: Message) -> bool:
+    """Return True if a response start message carries X-Source-Type: tar."""
+    for name, value in start_message.get("headers", []):
+        if name.lower() == b"x-source-type":
+            return value == b"tar"
+    return False
+
+
+class TileCacheMiddleware:
+    """
+    Pure ASGI middleware that serves repeat tile requests from a TileCache.
+
+    Only successful tar-sourced tile responses are cached: tar tiles change
+    only through an index rebuild (which invalidates the tileset), whereas
+    directory tiles may be replaced on disk at any time.
+    """
+
+    def __init__(self, app: ASGIApp, cache: TileCache) -> None:
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        entry = self.cache.get(path)
+        if entry is not None:
+            await self._send_cached(scope, entry, send)
+            return
+
+        # Taken before the app runs: a rebuild during a slow read must win
+        generation = self.cache.generation(path)
+        start_message: Optional[Message] = None
+        body_parts: List[bytes] = []
+
+        async def capture_send(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Decide up front, so only cacheable bodies are ever buffered
+                if message["status"] == 200 and _is_tar_response(message):
+                    start_message = message
+            elif message["type"] == "http.response.body" and start_message:
+                body_parts.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self._store(path, start_message, body_parts, generation)
+            await send(message)
+
+        await self.app(scope, receive, capture_send)
+
+    def _store(
+        self,
+        path: str,
+        start_message: Message,
+        body_parts: List[bytes],
+        generation: int,
+    ) -> None:
+        """Store a finished 200 tar tile response."""
+        headers: List[Tuple[bytes, bytes]] = list(start_message.get("headers", []))
+        header_map = {k.lower(): v for k, v in headers}
+        last_modified = header_map.get(b"last-modified")
+        self.cache.put(
+            path,
+            CachedTile(
+                headers,
+                b"".join(body_parts),
+                header_map.get(b"etag"),
+                parse_http_date(last_modified.decode("latin-1"))
+                if last_modified
+                else None,
+            ),
+            generation,
+        )
+
+    @staticmethod
+    async def _send_cached(scope: Scope, entry: CachedTile, send: Send) -> None:
+        """Replay a cached response, or a 304 if the client's copy is current."""
+        if_none_match: Optional[bytes] = None
+        if_modified_since: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value
+            elif name == b"if-modified-since":
+                if_modified_since = value
+
+        # If-Modified-Since only counts without If-None-Match (RFC 9110 13.2.2)
+        if if_none_match is not None:
+            not_modified = entry.etag is not None and (
+                if_none_match == entry.etag
+                or etag_matches(
+                    if_none_match.decode("latin-1"), entry.etag.decode("latin-1")
+                )
+            )
+        else:
+            since = (
+                parse_http_date(if_modified_since.decode("latin-1"))
+                if if_modified_since is not None
+                else None
+            )
+            not_modified = (
+                since is not None and entry.mtime is not None and entry.mtime <= since
+            )
+
+        if not_modified:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [
+                        (k, v)
+                        for k, v in entry.headers
+                        if k.lower() not in _BODY_HEADERS
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send(
+            {"type": "http.response.start", "status": 200, "headers": entry.headers}
+        )
+        await send({"type": "http.response.body", "body": entry.body})
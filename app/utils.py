@@ -1,10 +1,32 @@
 """Utility functions for tile detection, path finding, and media type resolution."""
 
+import datetime
+import email.utils
+import functools
+import os
+import stat
+import struct
+import sys
 from pathlib import Path
-from typing import Dict, List, NamedTuple, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    import tarfile
 
 # ---- Constants ----
 SUPPORTED_EXTS: Tuple[str, ...] = (".png", ".jpg", ".jpeg", ".webp")
+# MIME type per lowercased suffix; hot paths index this directly
+MEDIA_TYPES: Dict[str, str] = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+}
+DEFAULT_MEDIA_TYPE = "application/octet-stream"
+# Tiles never change in place during an event, so clients may cache them a day
+TILE_CACHE_CONTROL = "public, max-age=86400, immutable"
+# Directory tiles up to this size are read into memory and sent in one piece
+MAX_INLINE_TILE_SIZE = 1024 * 1024
 TAR_EXTENSIONS: Tuple[str, ...] = (
     ".tar",
     ".tar.gz",
@@ -16,19 +38,35 @@ TAR_EXTENSIONS: Tuple[str, ...] = (
 )
 
 
+def has_tar_extension(path: Path) -> bool:
+    """Check if a path's name ends with a tar extension, without touching disk."""
+    return path.name.endswith(TAR_EXTENSIONS)
+
+
 def is_tar_file(path: Path) -> bool:
     """
     Check if a path points to a tar archive based on file extension.
 
+    The extension is checked first so directories and other files never pay
+    for a stat() call.
+
     Args:
         path: Path to check.
 
     Returns:
         True if the path is a file with a tar extension, False otherwise.
     """
-    if not path.is_file():
-        return False
-    return any(str(path).endswith(ext) for ext in TAR_EXTENSIONS)
+    return has_tar_extension(path) and path.is_file()
+
+
+# Compression by last suffix segment: single-suffix names, then ".tar.<ext>"
+_TAR_SUFFIX_COMPRESSION: Dict[str, str] = {
+    "tar": "uncompressed",
+    "tgz": "gzip",
+    "tbz2": "bzip2",
+    "txz": "xz",
+}
+_TAR_OUTER_COMPRESSION: Dict[str, str] = {"gz": "gzip", "bz2": "bzip2", "xz": "xz"}
 
 
 def detect_tar_compression(tar_path: Path) -> str:
@@ -41,20 +79,141 @@ def detect_tar_compression(tar_path: Path) -> str:
     Returns:
         Compression type: "gzip", "bzip2", "xz", "uncompressed", or "unknown".
     """
-    path_str = str(tar_path)
-    if path_str.endswith((".tar.gz", ".tgz")):
-        return "gzip"
-    elif path_str.endswith((".tar.bz2", ".tbz2")):
-        return "bzip2"
-    elif path_str.endswith((".tar.xz", ".txz")):
-        return "xz"
-    elif path_str.endswith(".tar"):
-        return "uncompressed"
-    return "unknown"
+    stem, dot, ext = tar_path.name.rpartition(".")
+    if not dot:
+        return "unknown"
+    compression = _TAR_SUFFIX_COMPRESSION.get(ext)
+    if compression is None and stem.endswith(".tar"):
+        # Two-part suffix such as ".tar.gz"
+        compression = _TAR_OUTER_COMPRESSION.get(ext)
+    return compression or "unknown"
+
+
+_TAR_OPEN_MODES: Dict[str, str] = {
+    "uncompressed": "r:",
+    "gzip": "r:gz",
+    "bzip2": "r:bz2",
+    "xz": "r:xz",
+}
+
+
+def tar_open_mode(tar_path: Path) -> str:
+    """
+    Get the explicit tarfile.open mode for a tar archive based on its extension.
+
+    An explicit mode skips tarfile's compression probing; "r:*" is only used
+    when the extension gives no hint.
+
+    Args:
+        tar_path: Path to the tar archive.
+
+    Returns:
+        Mode string such as "r:" or "r:gz".
+    """
+    return _TAR_OPEN_MODES.get(detect_tar_compression(tar_path), "r:*")
+
+
+TAR_BLOCK_SIZE = 512
+_TAR_CHKSUM_FIELD = slice(148, 156)
+
+
+def check_tar_header(tar_path: Path) -> None:
+    """
+    Check that an uncompressed tar starts with a valid header block.
+
+    Reads only the first 512-byte block and verifies its checksum the same
+    way tarfile does, so V7 archives (which have no "ustar" magic) and empty
+    archives (an all-zero block) are accepted.
+
+    Args:
+        tar_path: Path to the uncompressed tar archive.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the first block is truncated or fails its checksum.
+    """
+    with open(tar_path, "rb") as f:
+        block = f.read(TAR_BLOCK_SIZE)
+    if len(block) < TAR_BLOCK_SIZE:
+        raise ValueError("file is too short to be a tar archive")
+    if block.count(0) == TAR_BLOCK_SIZE:
+        return
+    if not _tar_checksum_ok(block):
+        raise ValueError("invalid tar header checksum")
+
+
+def _tar_checksum_ok(block: bytes) -> bool:
+    """Verify a 512-byte header block's checksum, accepting signed sums like tarfile."""
+    field = block[_TAR_CHKSUM_FIELD].split(b"\0", 1)[0].strip()
+    try:
+        stored = int(field or b"0", 8)
+    except ValueError:
+        return False
+    # The checksum field itself counts as eight spaces (8 * 32 = 256)
+    unsigned = 256 + sum(block[:148]) + sum(block[156:])
+    if stored == unsigned:
+        return True
+    return stored == 256 + sum(struct.unpack_from("148b8x356b", block))
+
+
+def _tar_number(field: bytes) -> int:
+    """Decode a numeric header field: NUL/space-padded octal or GNU base-256."""
+    if field[0] in (0o200, 0o377):
+        value = int.from_bytes(field[1:], "big")
+        if field[0] == 0o377:
+            value -= 256 ** (len(field) - 1)
+        return value
+    return int(field.split(b"\0", 1)[0].strip() or b"0", 8)
+
+
+def _tar_string(field: bytes) -> str:
+    """Decode a NUL-terminated header string the way tarfile does on POSIX."""
+    return field.split(b"\0", 1)[0].decode("utf-8", "surrogateescape")
+
+
+def _parse_pax_records(data: bytes) -> Dict[str, str]:
+    """Parse the "<len> <key>=<value>\\n" records of a pax extended header."""
+    records: Dict[str, str] = {}
+    pos = 0
+    while pos < len(data) and data[pos] != 0:
+        space = data.index(b" ", pos)
+        length = int(data[pos:space])
+        key, _, value = data[space + 1 : pos + length - 1].partition(b"=")
+        records[key.decode("utf-8")] = value.decode("utf-8", "surrogateescape")
+        pos += length
+    return records
+
+
+def iter_tar_members(tar: "tarfile.TarFile") -> Iterator["tarfile.TarInfo"]:
+    """
+    Iterate tar members without retaining them on ``tar.members``.
+
+    ``for member in tar`` appends every TarInfo to ``tar.members``, so memory
+    grows linearly with archive size. Clearing the list after each ``next()``
+    keeps a scan of a million-member archive at O(1) memory.
+
+    Args:
+        tar: An open TarFile positioned at the start of the archive.
+
+    Yields:
+        Each TarInfo in archive order.
+    """
+    while True:
+        member = tar.next()
+        if member is None:
+            return
+        tar.members.clear()
+        yield member
 
 
 class TileEntry(NamedTuple):
-    """Lightweight index entry replacing a full TarInfo object."""
+    """
+    Lightweight index entry replacing a full TarInfo object.
+
+    Index builders intern ``suffix``, so the millions of entries of a large
+    tileset share a handful of extension strings instead of holding one copy
+    each; pickle memoizes the shared objects, keeping the ``.idx`` smaller too.
+    """
 
     offset: int  # TarInfo.offset_data — absolute byte position of tile data
     size: int  # byte length of the tile
@@ -71,14 +230,147 @@ def parse_tile_member_path(member_path: str) -> Optional[Tuple[str, str, str]]:
 
     Returns None if the path doesn't match the expected tile structure.
     """
-    parts = member_path.split("/")
+    # maxsplit=3 keeps any deep prefix in one piece instead of splitting it
+    parts = member_path.rsplit("/", 3)
     if len(parts) >= 3:
         z_str, x_str, y_name = parts[-3], parts[-2], parts[-1]
-        if z_str.isdigit() and x_str.isdigit():
+        # isdecimal, not isdigit: "²".isdigit() is True but int("²") fails
+        if z_str.isdecimal() and x_str.isdecimal():
             return z_str, x_str, y_name
     return None
 
 
+# Header typeflags (POSIX.1-1988 and GNU/pax extensions)
+_TAR_REGULAR_TYPES = frozenset(b"0\x007")
+_TAR_GNU_LONGNAME = ord("L")
+_TAR_GNU_LONGLINK = ord("K")
+_TAR_PAX_HEADER = ord("x")
+# Sparse files and global pax headers need tarfile's full machinery
+_TAR_UNSUPPORTED_TYPES = frozenset(b"Sg")
+_TAR_NO_DATA_TYPES = frozenset(b"123456")
+
+
+def scan_tar_file_entries(tar_path: Path) -> Iterator[Tuple[str, TileEntry]]:
+    """
+    Yield (member name, TileEntry) for each regular file of an uncompressed tar.
+
+    Parses the 512-byte headers directly instead of building a TarInfo per
+    member, seeking over file data, and produces the same names, offsets,
+    sizes and mtimes as tarfile for ustar, GNU long-name and pax archives.
+    Archive features that would need tarfile's full machinery (sparse
+    files, global pax headers) raise ValueError so callers can fall back.
+
+    Args:
+        tar_path: Path to the uncompressed tar archive.
+
+    Yields:
+        Tuples of (member name, TileEntry) in archive order.
+
+    Raises:
+        OSError: If the archive cannot be read.
+        ValueError: If a header is invalid, the archive is truncated, or it
+            uses an unsupported feature.
+    """
+    with open(tar_path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        offset = 0
+        long_name: Optional[str] = None
+        pax: Optional[Dict[str, str]] = None
+        while True:
+            block = f.read(TAR_BLOCK_SIZE)
+            if len(block) < TAR_BLOCK_SIZE:
+                if offset == 0:
+                    raise ValueError("empty or truncated tar archive")
+                return
+            if block.count(0) == TAR_BLOCK_SIZE:
+                return
+            if not _tar_checksum_ok(block):
+                if offset == 0:
+                    raise ValueError("invalid tar header checksum")
+                return  # tarfile also stops quietly at a bad later header
+
+            typeflag = block[156]
+            size = _tar_number(block[124:136])
+            data_offset = offset + TAR_BLOCK_SIZE
+            data_blocks = -(-size // TAR_BLOCK_SIZE) * TAR_BLOCK_SIZE
+            offset = data_offset + data_blocks
+
+            if typeflag == _TAR_GNU_LONGNAME:
+                long_name = _tar_string(f.read(data_blocks)[:size])
+                continue
+            if typeflag == _TAR_PAX_HEADER:
+                pax = _parse_pax_records(f.read(data_blocks)[:size])
+                if any(key.startswith("GNU.sparse.") for key in pax):
+                    raise ValueError("sparse members are not supported")
+                continue
+            if typeflag == _TAR_GNU_LONGLINK:
+                f.seek(data_blocks, os.SEEK_CUR)
+                continue
+            if typeflag in _TAR_UNSUPPORTED_TYPES:
+                raise ValueError(f"unsupported tar member type {chr(typeflag)!r}")
+            if typeflag not in _TAR_REGULAR_TYPES:
+                # Mirror tarfile: links, directories and devices carry no data
+                # even if their size field is set; other types are skipped.
+                if typeflag in _TAR_NO_DATA_TYPES:
+                    offset = data_offset
+                else:
+                    f.seek(data_blocks, os.SEEK_CUR)
+                long_name = pax = None
+                continue
+
+            name = _tar_string(block[0:100])
+            prefix = _tar_string(block[345:500])
+            if prefix:
+                name = f"{prefix}/{name}"
+            mtime: float = _tar_number(block[136:148])
+            if long_name is not None:
+                name = long_name
+            if pax is not None:
+                name = pax.get("path", name)
+                if "size" in pax:
+                    size = int(pax["size"])
+                    data_blocks = -(-size // TAR_BLOCK_SIZE) * TAR_BLOCK_SIZE
+                    offset = data_offset + data_blocks
+                if "mtime" in pax:
+                    mtime = float(pax["mtime"])
+            long_name = pax = None
+
+            if offset > file_size:
+                raise ValueError("unexpected end of data")
+            f.seek(data_blocks, os.SEEK_CUR)
+            if typeflag == 0 and name.endswith("/"):
+                continue  # old-style directory entry
+            suffix = os.path.splitext(name)[1]
+            yield (
+                name,
+                TileEntry(
+                    offset=data_offset,
+                    size=size,
+                    mtime=mtime,
+                    suffix=sys.intern("" if suffix == "." else suffix.lower()),
+                ),
+            )
+
+
+def split_y_name(y_name: str) -> Tuple[str, str]:
+    """
+    Split a Y filename into its stem and lowercased extension.
+
+    Same result as Path(y_name).stem and .suffix.lower() for a bare filename,
+    without building a Path on every tile request.
+
+    Args:
+        y_name: Y coordinate with file extension (e.g., "123.png").
+
+    Returns:
+        Tuple of (stem, extension including the dot or "" if there is none).
+    """
+    dot = y_name.rfind(".")
+    if 0 < dot < len(y_name) - 1:
+        return y_name[:dot], y_name[dot:].lower()
+    return y_name, ""
+
+
 def find_tile_in_tar_index(
     tar_index: Dict[str, TileEntry], z: int, x: int, y_name: str
 ) -> Tuple[Optional[TileEntry], List[str]]:
@@ -96,9 +388,7 @@ def find_tile_in_tar_index(
     Returns:
         Tuple of (TileEntry if found else None, list of tried extensions).
     """
-    y_path = Path(y_name)
-    stem = y_path.stem
-    ext = y_path.suffix.lower()
+    stem, ext = split_y_name(y_name)
 
     candidates: List[str] = []
     tried_extensions: List[str] = []
@@ -138,28 +428,226 @@ def find_tile_path(
     Returns:
         Tuple of (Path if found else None, list of tried extensions).
     """
-    y_path = Path(y_name)
-    stem = y_path.stem
-    ext = y_path.suffix.lower()
+    tile_path, _, tried_extensions = find_tile_path_with_stat(base_dir, z, x, y_name)
+    return tile_path, tried_extensions
+
+
+def find_tile_path_with_stat(
+    base_dir: Path, z: int, x: int, y_name: str
+) -> Tuple[Optional[Path], Optional[os.stat_result], List[str]]:
+    """
+    Find a directory tile and return the stat() result used to find it.
+
+    Each probe is a single os.stat(), so the caller gets the file's size and
+    mtime (for ETag and Content-Length) without another filesystem call.
 
-    candidates: List[Path] = []
+    Args:
+        base_dir: Base directory of the tileset.
+        z: Zoom level.
+        x: X tile coordinate.
+        y_name: Y coordinate with file extension (e.g., "123.png").
+
+    Returns:
+        Tuple of (Path if found else None, its stat result if found else None,
+        list of tried extensions).
+    """
+    stem, ext = split_y_name(y_name)
+
+    candidates: List[str] = []
     tried_extensions: List[str] = []
 
     # Try exact name if extension provided and supported
     if ext in SUPPORTED_EXTS:
-        candidates.append(base_dir / str(z) / str(x) / y_name)
+        candidates.append(y_name)
         tried_extensions.append(ext)
 
     # Probe other extensions
     for e in SUPPORTED_EXTS:
         if e != ext:
-            candidates.append(base_dir / str(z) / str(x) / f"{stem}{e}")
+            candidates.append(stem + e)
             tried_extensions.append(e)
 
-    for p in candidates:
-        if p.is_file():
-            return p, tried_extensions
-    return None, tried_extensions
+    # Probe plain string paths; a Path is only built for the file found
+    column = f"{base_dir}/{z}/{x}/"
+    for name in candidates:
+        p = column + name
+        try:
+            st = os.stat(p)
+        except (OSError, ValueError):
+            continue
+        if stat.S_ISREG(st.st_mode):
+            return Path(p), st, tried_extensions
+    return None, None, tried_extensions
+
+
+def read_tile_file(
+    base_dir: Path,
+    z: int,
+    x: int,
+    y_name: str,
+    max_size: int = MAX_INLINE_TILE_SIZE,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[str] = None,
+) -> Tuple[Optional[Path], Optional[os.stat_result], Optional[bytes], List[str]]:
+    """
+    Find a directory tile and, if it is small enough, read it into memory.
+
+    Probe, open, fstat and read all happen in the calling thread, so the
+    event loop pays a single thread-pool hop per directory tile.
+
+    Args:
+        base_dir: Base directory of the tileset.
+        z: Zoom level.
+        x: X tile coordinate.
+        y_name: Y coordinate with file extension (e.g., "123.png").
+        max_size: Largest file, in bytes, to read inline.
+        if_none_match: The client's If-None-Match value; the file is not read
+            when it matches the tile's weak ETag, since the reply will be a 304.
+        if_modified_since: The client's If-Modified-Since value, used the same
+            way when there is no If-None-Match.
+
+    Returns:
+        Tuple of (Path if found else None, its stat result if found else None,
+        file contents or None if not read, list of tried extensions). The stat
+        result comes from the open file, so it matches the returned bytes even
+        if the file was just replaced.
+
+    Raises:
+        OSError: If the tile was found but could not be opened or read.
+    """
+    tile_path, st, tried_extensions = find_tile_path_with_stat(base_dir, z, x, y_name)
+    if (
+        tile_path is None
+        or st is None
+        or st.st_size > max_size
+        or (
+            (if_none_match or if_modified_since)
+            and is_not_modified(
+                if_none_match,
+                if_modified_since,
+                weak_etag(st.st_mtime_ns, st.st_size),
+                st.st_mtime_ns // 1_000_000_000,
+            )
+        )
+    ):
+        return tile_path, st, None, tried_extensions
+    with open(tile_path, "rb", buffering=0) as f:
+        st = os.fstat(f.fileno())
+        data = f.read()
+    return tile_path, st, data, tried_extensions
+
+
+@functools.lru_cache(maxsize=4096)
+def http_date(timestamp: int) -> str:
+    """
+    Format a whole-second Unix timestamp as an HTTP date, memoized.
+
+    Tiles in a tileset share a small set of modification times, so the
+    Last-Modified value is almost always a cache hit.
+
+    Args:
+        timestamp: Seconds since the epoch.
+
+    Returns:
+        RFC 7231 date string, e.g. "Wed, 01 Jan 2025 00:00:00 GMT".
+    """
+    return email.utils.formatdate(timestamp, usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against a tile's ETag (RFC 9110 weak match).
+
+    The header may list several ETags or be "*"; W/ prefixes are ignored on
+    both sides. The common single-ETag echo is decided by the first compare.
+
+    Args:
+        if_none_match: Raw If-None-Match header value.
+        etag: The tile's current ETag.
+
+    Returns:
+        True if the client's cached copy is current (reply 304).
+    """
+    if if_none_match == etag:
+        return True
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_http_date(value: str) -> Optional[int]:
+    """
+    Parse an HTTP date (e.g. an If-Modified-Since value) to Unix seconds, memoized.
+
+    Clients echo back the Last-Modified values this server sent, so the set
+    of distinct inputs is as small as the one http_date formats.
+
+    Args:
+        value: Header value in any RFC 5322 / RFC 9110 date form.
+
+    Returns:
+        Whole seconds since the epoch, or None if the value is not a date.
+    """
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed.tzinfo is None:  # "-0000" zone: treat as UTC, as HTTP dates are
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return int(parsed.timestamp())
+
+
+def is_not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    mtime: int,
+) -> bool:
+    """
+    Decide whether a conditional GET can be answered with 304 Not Modified.
+
+    Follows RFC 9110 section 13.2.2: If-Modified-Since is only evaluated when
+    the request has no If-None-Match.
+
+    Args:
+        if_none_match: Raw If-None-Match header value, if any.
+        if_modified_since: Raw If-Modified-Since header value, if any.
+        etag: The tile's current ETag.
+        mtime: The tile's modification time in whole seconds.
+
+    Returns:
+        True if the client's cached copy is current (reply 304).
+    """
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if if_modified_since:
+        since = parse_http_date(if_modified_since)
+        return since is not None and mtime <= since
+    return False
+
+
+# typed=True: a float mtime must not reuse the entry of an equal int one
+@functools.lru_cache(maxsize=4096, typed=True)
+def weak_etag(mtime: float, size: int) -> str:
+    """
+    Build the weak ETag for a tile from its modification time and size, memoized.
+
+    Args:
+        mtime: Modification time (st_mtime_ns for directories, tar member mtime).
+        size: Tile size in bytes.
+
+    Returns:
+        ETag header value, e.g. 'W/"1700000000-1234"'.
+    """
+    return f'W/"{mtime}-{size}"'
 
 
 def media_type_for_suffix(suffix: str) -> Optional[str]:
@@ -172,11 +660,4 @@ def media_type_for_suffix(suffix: str) -> Optional[str]:
     Returns:
         MIME type string (e.g., "image/png") or None if unsupported.
     """
-    suffix = suffix.lower()
-    if suffix == ".png":
-        return "image/png"
-    if suffix in (".jpg", ".jpeg"):
-        return "image/jpeg"
-    if suffix == ".webp":
-        return "image/webp"
-    return None
+    return MEDIA_TYPES.get(suffix.lower())
@@ -18,13 +18,12 @@ Features:
 """
 
 import argparse
-import re
 import sys
 import tarfile
 import time
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 
 class TarInspectionTimeout(Exception):
@@ -33,16 +32,28 @@ class TarInspectionTimeout(Exception):
     pass
 
 
+# Compression by last suffix segment, then by ".tar.<ext>" (as in app.utils)
+_SUFFIX_COMPRESSION = {
+    "tar": "uncompressed",
+    "tgz": "gzip",
+    "tbz2": "bzip2",
+    "txz": "xz",
+}
+_OUTER_COMPRESSION = {"gz": "gzip", "bz2": "bzip2", "xz": "xz"}
+
+# The member loop only checks the clock every 64 members; small enough that
+# the timeout still fires well within the default 1000-member limit
+_TIMEOUT_CHECK_MASK = 0x3F
+
+
 def detect_compression(tar_path: Path) -> str:
     """Detect compression type of tar archive."""
-    if tar_path.suffix == ".tgz" or tar_path.name.endswith(".tar.gz"):
-        return "gzip"
-    elif tar_path.name.endswith(".tar.bz2") or tar_path.suffix == ".tbz2":
-        return "bzip2"
-    elif tar_path.name.endswith(".tar.xz") or tar_path.suffix == ".txz":
-        return "xz"
-    elif tar_path.suffix == ".tar":
-        return "uncompressed"
+    stem, dot, ext = tar_path.name.rpartition(".")
+    compression = _SUFFIX_COMPRESSION.get(ext) if dot else None
+    if compression is None and dot and stem.endswith(".tar"):
+        compression = _OUTER_COMPRESSION.get(ext)
+    if compression is not None:
+        return compression
     else:
         # Try to detect by opening
         try:
@@ -54,14 +65,39 @@ def detect_compression(tar_path: Path) -> str:
         return "unknown"
 
 
+def match_tile_path(name: str) -> Optional[Tuple[str, int, str]]:
+    """
+    Match a member path against {base_path/}{z}/{x}/{y}.{ext}.
+
+    Plain string splitting instead of a regex: this runs once per member.
+
+    Returns:
+        (base_path with trailing slash or "", z, y_name), or None if the
+        path is not a tile.
+    """
+    parts = name.rsplit("/", 3)
+    if len(parts) < 3:
+        return None
+    z_str, x_str, y_name = parts[-3:]
+    if not (z_str.isdecimal() and x_str.isdecimal()):
+        return None
+    y_stem, _, ext = y_name.partition(".")
+    if not (y_stem.isdecimal() and ext.isalnum()):
+        return None
+    base_path = parts[0] + "/" if len(parts) == 4 else ""
+    return base_path, int(z_str), y_name
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
 def format_size(size_bytes: int) -> str:
     """Format byte size to human-readable string."""
-    size: float = float(size_bytes)
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if size < 1024.0:
-            return f"{size:.1f} {unit}"
-        size /= 1024.0
-    return f"{size:.1f} PB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Each unit is 10 more bits, so bit_length picks the unit directly
+    idx = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * idx)):.1f} {_SIZE_UNITS[idx]}"
 
 
 def inspect_tar_structure(
@@ -82,14 +118,23 @@ def inspect_tar_structure(
     total_size = 0
     extensions: Dict[str, int] = defaultdict(int)
 
-    # Pattern to match tile paths: {something}/{z}/{x}/{y.ext}
-    tile_pattern = re.compile(r"^(.*/)?(\d+)/(\d+)/(\d+\.\w+)$")
+    detected_base_path = None
 
     try:
         with tarfile.open(tar_path, "r:*") as tar:
-            for member in tar:
+            # next() + clearing tar.members instead of `for member in tar`,
+            # which keeps every TarInfo alive until the archive is closed
+            while True:
+                member = tar.next()
+                if member is None:
+                    break
+                tar.members.clear()
+
                 # Check timeout
-                if time.time() - start_time > timeout_seconds:
+                if (
+                    total_members & _TIMEOUT_CHECK_MASK == 0
+                    and time.time() - start_time > timeout_seconds
+                ):
                     raise TarInspectionTimeout(
                         f"Inspection timed out after {timeout_seconds}s. "
                         f"Scanned {total_members} members."
@@ -106,27 +151,29 @@ def inspect_tar_structure(
                 total_members += 1
                 total_size += member.size
 
-                # Track top-level directories
-                parts = member.name.split("/")
-                if len(parts) > 1 and member.isdir():
-                    top_level_dirs.add(parts[0])
+                # Track top-level directories; only directory members are
+                # split, and only up to their first slash
+                if member.isdir():
+                    slash = member.name.find("/")
+                    if slash >= 0:
+                        top_level_dirs.add(member.name[:slash])
 
                 # Check if this looks like a tile
-                if member.isfile():
-                    match = tile_pattern.match(member.name)
+                elif member.isfile():
+                    match = match_tile_path(member.name)
                     if match:
-                        # Groups: (1) base_path, (2) z, (3) x, (4) y_name
-                        z = int(match.group(2))
-                        y_name = match.group(4)
+                        base_path, z, y_name = match
 
                         zoom_levels.add(z)
 
-                        # Collect samples
+                        # Collect samples; the first tile decides the base path
+                        if not tile_samples and base_path:
+                            detected_base_path = base_path.rstrip("/")
                         if len(tile_samples) < 10:
                             tile_samples.append(member.name)
 
                         # Track extension
-                        ext = Path(y_name).suffix.lower()
+                        ext = y_name[y_name.index(".") :].lower()
                         extensions[ext] += 1
 
     except TarInspectionTimeout:
@@ -139,15 +186,6 @@ def inspect_tar_structure(
 
     elapsed = time.time() - start_time
 
-    # Detect base_path from tile samples
-    detected_base_path = None
-    if tile_samples:
-        first_tile = tile_samples[0]
-        match = tile_pattern.match(first_tile)
-        if match and match.group(1):
-            # Remove trailing slash
-            detected_base_path = match.group(1).rstrip("/")
-
     return {
         "success": True,
         "members_scanned": total_members,
@@ -64,6 +64,14 @@ def generate_test_config() -> Path:
     return TEST_CONFIG_PATH
 
 
+@pytest.fixture(scope="session", autouse=True)
+def isolate_cache_dirs():
+    """Clear TILE_SCAN_CACHE_DIR so tests only write a scan cache when they opt in."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.delenv("TILE_SCAN_CACHE_DIR", raising=False)
+        yield
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_config():
     """
@@ -25,12 +25,13 @@ def _parse(argv):
 # ---------------------------------------------------------------------------
 
 
-def test_defaults():
+def test_defaults(monkeypatch):
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
     args = _parse([])
     assert args.config == "config.json"
     assert args.port == 8000
     assert args.bind == "0.0.0.0"
-    assert args.workers == 4
+    assert args.workers == 1
     assert args.reload is False
     assert args.event_mode is False
     assert args.no_scan is False
@@ -60,6 +61,30 @@ def test_workers_flag():
     assert _parse(["--workers", "8"]).workers == 8
 
 
+def test_workers_default_from_web_concurrency(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert _parse([]).workers == 3
+    assert _parse(["--workers", "2"]).workers == 2
+
+
+def test_workers_empty_web_concurrency_means_one(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "")
+    assert _parse([]).workers == 1
+
+
+@pytest.mark.parametrize("value", ["four", "0", "-2"])
+def test_workers_invalid_web_concurrency_exits(monkeypatch, value):
+    monkeypatch.setenv("WEB_CONCURRENCY", value)
+    with pytest.raises(SystemExit) as exc:
+        _parse([])
+    assert exc.value.code == 2
+
+
+def test_workers_flag_overrides_invalid_web_concurrency(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "four")
+    assert _parse(["--workers", "2"]).workers == 2
+
+
 def test_reload_flag():
     assert _parse(["--reload"]).reload is True
 
@@ -369,4 +394,25 @@ def test_main_default_port_and_bind_passed_to_uvicorn():
                 kwargs = mock_run.call_args[1]
                 assert kwargs.get("port") == 8000
                 assert kwargs.get("host") == "0.0.0.0"
-                assert kwargs.get("workers") == 4
+                assert kwargs.get("workers") == 1
+
+
+def test_main_single_worker_has_no_request_limit():
+    """A lone worker is never recycled, so it must not exit after N requests."""
+    with patch(
+        "sys.argv", ["app", str(TEST_CONFIG_PATH), "--workers", "1", "--no-scan"]
+    ):
+        with patch("uvicorn.run") as mock_run:
+            with patch.dict("os.environ", {}, clear=False):
+                main()
+                assert "limit_max_requests" not in mock_run.call_args[1]
+
+
+def test_main_multiple_workers_recycle_after_request_limit():
+    with patch(
+        "sys.argv", ["app", str(TEST_CONFIG_PATH), "--workers", "4", "--no-scan"]
+    ):
+        with patch("uvicorn.run") as mock_run:
+            with patch.dict("os.environ", {}, clear=False):
+                main()
+                assert mock_run.call_args[1].get("limit_max_requests") == 50000
@@ -1,5 +1,8 @@
 """Integration tests for the tile server API endpoints."""
 
+import json
+import logging
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -151,6 +154,15 @@ def test_invalid_zoom_level_error(client):
     assert "99" in data["message"]
 
 
+@pytest.mark.parametrize(
+    "path", ["/test_directory/abc/0/0.png", "/test_directory/10/x/0.png"]
+)
+def test_non_integer_coordinates_rejected(client, path):
+    """Non-integer z or x is rejected with 422 before any lookup."""
+    response = client.get(path)
+    assert response.status_code == 422
+
+
 def test_invalid_x_coordinate_error(client):
     """Test that requesting a tile with invalid X coordinate returns 404."""
     # At zoom 10, max coordinate is 2^10 - 1 = 1023
@@ -171,13 +183,37 @@ def test_invalid_y_coordinate_error(client):
     assert "9999" in data["message"]
 
 
+@pytest.mark.parametrize("y", [".hidden.png", "%2E%2E", "0%5C0.png"])
+def test_path_like_y_rejected(client, y):
+    """Y values that could escape or hide in the tile directory return 400."""
+    response = client.get(f"/test_directory/10/0/{y}")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("y", ["1..png", "a..b.webp"])
+def test_y_with_inner_dots_accepted(client, y):
+    """Consecutive dots inside a filename are not a traversal attempt."""
+    response = client.get(f"/test_directory/10/0/{y}")
+    assert response.status_code == 404
+    assert response.json()["error"] == "TILE_NOT_FOUND"
+
+
 def test_tile_not_found_error_format(client):
     """Test that tile not found returns proper error format."""
     response = client.get("/test_directory/10/0/999.png")
     assert response.status_code == 404
     data = response.json()
     assert data["error"] == "TILE_NOT_FOUND"
-    assert "path" in data
+    assert data["path"] == "/test_directory/10/0/999.png"
+
+
+def test_tile_not_found_logged_below_warning(client, caplog):
+    """Routine 404s stay out of WARNING-level (event mode) logs."""
+    with caplog.at_level(logging.INFO, logger="event_tile_server"):
+        client.get("/test_directory/10/0/999.png")
+    records = [r for r in caplog.records if "TILE_NOT_FOUND" in r.getMessage()]
+    assert records
+    assert all(r.levelno == logging.INFO for r in records)
 
 
 def test_tileset_not_found_error_format(client):
@@ -201,6 +237,14 @@ def test_security_headers(client):
     assert response.headers.get("Referrer-Policy") == "no-referrer"
 
 
+def test_security_headers_on_error_response(client):
+    """Security headers are added to error responses too."""
+    response = client.get("/nonexistent/10/0/0.png")
+    assert response.status_code == 404
+    assert response.headers.get("X-Content-Type-Options") == "nosniff"
+    assert response.headers.get("Referrer-Policy") == "no-referrer"
+
+
 def test_cache_headers_on_tile(client):
     """Test that proper cache headers are set on tile responses."""
     response = client.get("/test_directory/10/0/0.png")
@@ -225,6 +269,22 @@ def test_304_not_modified_directory(client):
     assert len(response.content) == 0  # No body for 304
 
 
+def test_tar_tile_has_content_length(client):
+    """Tar tiles are sent as one body with Content-Length, not chunked."""
+    response = client.get("/test_tar_uncompressed/10/0/0.png")
+    assert response.status_code == 200
+    assert response.headers["Content-Length"] == str(len(response.content))
+    assert "Transfer-Encoding" not in response.headers
+
+
+def test_directory_tile_headers_from_probe_stat(client):
+    """Directory tiles keep our ETag and get Content-Length from the probe stat."""
+    response = client.get("/test_directory/10/0/0.png")
+    assert response.status_code == 200
+    assert response.headers["Content-Length"] == str(len(response.content))
+    assert response.headers["ETag"].startswith('W/"')
+
+
 def test_304_not_modified_tar(client):
     """Test that conditional requests return 304 for tar tiles."""
     # First request to get ETag
@@ -241,6 +301,41 @@ def test_304_not_modified_tar(client):
     assert len(response.content) == 0  # No body for 304
 
 
+@pytest.mark.parametrize(
+    "path", ["/test_directory/10/0/1.png", "/test_tar_uncompressed/10/0/1.png"]
+)
+def test_304_with_etag_list(client, path):
+    """An If-None-Match list containing the tile's ETag yields 304."""
+    etag = client.get(path).headers["ETag"]
+    response = client.get(path, headers={"If-None-Match": f'"other", {etag}'})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize(
+    "path", ["/test_directory/10/0/1.png", "/test_tar_uncompressed/10/0/1.png"]
+)
+def test_304_if_modified_since(client, path):
+    """If-Modified-Since yields 304 unless If-None-Match is also sent."""
+    first = client.get(path)
+    last_modified = first.headers["Last-Modified"]
+
+    response = client.get(path, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == first.headers["ETag"]
+
+    response = client.get(
+        path,
+        headers={"If-Modified-Since": last_modified, "If-None-Match": '"wrong-etag"'},
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        path, headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"}
+    )
+    assert response.status_code == 200
+
+
 def test_no_304_with_wrong_etag(client):
     """Test that wrong ETag still returns full response."""
     response = client.get(
@@ -311,6 +406,24 @@ def test_admin_rescan_updates_metadata(client):
     assert after["zoom_levels"] == rescan_data["zoom_levels"]
     assert after["scanned_at"] == rescan_data["scanned_at"]
 
+    # The pre-rendered root summary is refreshed too
+    root = client.get("/").json()
+    assert root["tilesets"]["test_directory"]["scanned_at"] == rescan_data["scanned_at"]
+
+
+def test_admin_rescan_updates_tile_zoom_bounds():
+    """Tile requests use the zoom bounds from the latest rescan."""
+    app = create_app(config_path=str(TEST_CONFIG_PATH), do_scan=False)
+    with TestClient(app) as test_client:
+        # Without a startup scan the default bounds accept z=5
+        response = test_client.get("/test_directory/5/0/0.png")
+        assert response.json()["error"] == "TILE_NOT_FOUND"
+
+        assert test_client.post("/admin/rescan/test_directory").status_code == 200
+
+        response = test_client.get("/test_directory/5/0/0.png")
+        assert response.json()["error"] == "INVALID_ZOOM_LEVEL"
+
 
 # ============================================================================
 # App Configuration Tests
@@ -336,6 +449,34 @@ def test_create_app_without_scan():
         assert "zoom_range" in data
 
 
+def test_startup_uses_pre_scanned_metadata_file(tmp_path):
+    """Workers take zoom bounds from the MAIN process's metadata file."""
+    metadata = {
+        "test_directory": {
+            "source_path": "unused",
+            "source_type": "directory",
+            "tile_count": 1,
+            "tile_count_complete": True,
+            "sample_tiles": [],
+            "zoom_levels": [10],
+            "min_zoom": 10,
+            "max_zoom": 10,
+        }
+    }
+    metadata_file = tmp_path / "tile_metadata.json"
+    metadata_file.write_text(json.dumps(metadata))
+
+    app = create_app(
+        config_path=str(TEST_CONFIG_PATH),
+        do_scan=False,
+        metadata_file=str(metadata_file),
+    )
+    with TestClient(app) as test_client:
+        assert test_client.get("/test_directory/10/0/0.png").status_code == 200
+        response = test_client.get("/test_directory/11/0/0.png")
+        assert response.json()["error"] == "INVALID_ZOOM_LEVEL"
+
+
 def test_server_mode_header_development(client):
     """Dev mode: X-Tile-Server is 'development', X-Cache-Strategy is absent."""
     response = client.get("/test_directory/10/0/0.png")
@@ -1,8 +1,12 @@
 """Property-based tests for the tile server using Hypothesis."""
 
+from pathlib import Path
+
 from hypothesis import given, settings
 from hypothesis import strategies as st
 
+from app.utils import split_y_name
+
 # Note: The 'client' fixture is provided by conftest.py
 
 
@@ -61,3 +65,14 @@ def test_get_invalid_tile_coords(client, tileset, z, x, y):
 
     response = client.get(f"/{tileset}/{z}/{x}/{y}.png")
     assert response.status_code == 404
+
+
+@given(
+    y_name=st.text(
+        alphabet=st.characters(blacklist_characters="/\x00"), min_size=1
+    ).filter(lambda s: not s.startswith("."))
+)
+def test_split_y_name_matches_path(y_name):
+    """split_y_name agrees with Path.stem / Path.suffix for any sanitized Y name."""
+    path = Path(y_name)
+    assert split_y_name(y_name) == (path.stem, path.suffix.lower())
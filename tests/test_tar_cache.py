@@ -1,5 +1,6 @@
 import asyncio
 import os
+import pickle
 import tarfile
 from pathlib import Path
 from io import BytesIO
@@ -10,11 +11,14 @@ import shutil
 from app.tar_manager import (
     TarManager,
     _touch_sentinel,
+    load_cached_tar_index,
     load_or_build_tar_index,
     get_tar_cache_path,
     build_unified_tar_index,
     filter_index_for_tileset,
+    _build_index_with_tarfile,
 )
+from app.utils import scan_tar_file_entries
 
 
 @pytest.fixture(scope="function")
@@ -148,6 +152,57 @@ def test_filter_index_for_tileset_excludes_non_matching_base(temp_dir):
 # ============================================================================
 
 
+@pytest.mark.parametrize(
+    "tar_format", [tarfile.USTAR_FORMAT, tarfile.GNU_FORMAT, tarfile.PAX_FORMAT]
+)
+def test_header_scan_matches_tarfile(temp_dir, tar_format):
+    tar_path = temp_dir / "formats.tar"
+    names = ["tiles/10/0/0.png", "p" * 120 + "/10/0/1.jpg", "ünï/10/1/0.webp"]
+    if tar_format == tarfile.USTAR_FORMAT:
+        names[1] = "p" * 90 + "/10/0/1.jpg"  # ustar caps names at 100+155 bytes
+    with tarfile.open(tar_path, "w", format=tar_format) as tar:
+        tiles_dir = tarfile.TarInfo("tiles")
+        tiles_dir.type = tarfile.DIRTYPE
+        tar.addfile(tiles_dir)
+        for i, name in enumerate(names):
+            data = b"t" * (600 + i)
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1700000000 + i
+            tar.addfile(info, BytesIO(data))
+        link = tarfile.TarInfo("tiles/link.png")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "10/0/0.png"
+        tar.addfile(link)
+
+    scanned = dict(scan_tar_file_entries(tar_path))
+    assert scanned == _build_index_with_tarfile(tar_path)
+    assert set(scanned) == set(names)
+
+
+def test_index_entries_share_suffix_strings(tar_file):
+    for index in (
+        dict(scan_tar_file_entries(tar_file)),
+        _build_index_with_tarfile(tar_file),
+    ):
+        png_suffixes = {id(e.suffix) for e in index.values() if e.suffix == ".png"}
+        assert len(png_suffixes) == 1
+
+    # pickle memoizes the shared strings, so a reloaded index shares them too
+    reloaded = pickle.loads(pickle.dumps(dict(scan_tar_file_entries(tar_file))))
+    assert len({id(e.suffix) for e in reloaded.values() if e.suffix == ".png"}) == 1
+
+
+def test_build_unified_tar_index_falls_back_to_tarfile(tar_file, monkeypatch):
+    def unsupported(tar_path):
+        raise ValueError("unsupported tar member type 'S'")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr("app.tar_manager.scan_tar_file_entries", unsupported)
+    index = build_unified_tar_index(tar_file)
+    assert len(index) == 8
+
+
 def test_touch_sentinel_creates_file(temp_dir):
     sentinel = temp_dir / ".tar_reload"
     assert not sentinel.exists()
@@ -322,3 +377,38 @@ def test_sentinel_watcher_detects_change_and_reloads(tar_file, temp_dir):
         await manager.close_all()
 
     asyncio.run(run())
+
+
+def test_load_cached_tar_index_rejects_size_change(tar_file):
+    """A cache whose stored (mtime_ns, size) stamp no longer matches is stale."""
+    load_or_build_tar_index(tar_file)
+    assert load_cached_tar_index(tar_file) is not None
+
+    # Grow the tar but keep the cache newer than it, so only the stamp differs
+    with open(tar_file, "ab") as f:
+        f.write(b"\0" * 512)
+    cache_path = get_tar_cache_path(tar_file)
+    future = tar_file.stat().st_mtime + 10
+    os.utime(cache_path, (future, future))
+
+    assert load_cached_tar_index(tar_file) is None
+
+
+def test_scan_tiles_tar_uses_cached_index(tar_file, monkeypatch):
+    """scan_tiles derives tar metadata from a fresh .idx without reopening the tar."""
+    from app import config
+
+    load_or_build_tar_index(tar_file)
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("tar should not be reopened when the cache is fresh")
+
+    monkeypatch.setattr(tarfile, "open", fail_open)
+    tile_count, samples, zoom_levels, min_z, max_z, complete = config.scan_tiles(
+        tar_file, "tar", max_samples=3
+    )
+
+    assert tile_count == 8
+    assert len(samples) == 3
+    assert zoom_levels == [10, 11]
+    assert complete is True
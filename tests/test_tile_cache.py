@@ -0,0 +1,302 @@
+"""Tests for the in-process tile response cache and directory ETag memo."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.tile_cache import (
+    CACHE_ENTRY_OVERHEAD,
+    CachedTile,
+    EtagCache,
+    TileCache,
+    TileCacheMiddleware,
+)
+from tests.conftest import TEST_CONFIG_PATH
+
+
+def _entry(size: int) -> CachedTile:
+    """Build a cached response with a body of the given size."""
+    return CachedTile([(b"etag", b'"x"')], b"x" * size, b'"x"')
+
+
+def test_tile_cache_evicts_least_recently_used():
+    """The least recently used entry is evicted once the budget is exceeded."""
+    # Room for two of these entries (same path length), not three
+    charged = _entry(4).size + len("/a/1/0/0.png")
+    cache = TileCache(max_bytes=2 * charged + charged // 2)
+    cache.put("/a/1/0/0.png", _entry(4))
+    cache.put("/a/1/0/1.png", _entry(4))
+    # Touch the first entry so the second becomes least recently used
+    assert cache.get("/a/1/0/0.png") is not None
+    cache.put("/a/1/1/0.png", _entry(4))
+
+    assert cache.get("/a/1/0/1.png") is None
+    assert cache.get("/a/1/0/0.png") is not None
+    assert cache.current_bytes == 2 * charged
+
+
+def test_tile_cache_skips_oversized_entries():
+    """An entry larger than the whole budget is not cached at all."""
+    cache = TileCache(max_bytes=_entry(0).size + 10)
+    cache.put("/a/1/0/0.png", _entry(11))
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
+
+
+def test_tile_cache_charges_headers_and_overhead():
+    """Empty bodies still cost memory, so many of them stay within budget."""
+    entry = _entry(0)
+    assert entry.size == len(b"etag") + len(b'"x"') + CACHE_ENTRY_OVERHEAD
+
+    cache = TileCache(max_bytes=100 * CACHE_ENTRY_OVERHEAD)
+    for x in range(1000):
+        cache.put(f"/a/10/{x}/0.png", _entry(0))
+
+    assert 0 < len(cache) < 100
+    assert cache.current_bytes <= cache.max_bytes
+
+
+def test_tile_cache_invalidate_only_matching_tileset():
+    """Invalidating a tileset leaves tilesets with a shared name prefix alone."""
+    cache = TileCache()
+    cache.put("/a/1/0/0.png", _entry(1))
+    cache.put("/ab/1/0/0.png", _entry(1))
+
+    cache.invalidate("a")
+
+    assert cache.get("/a/1/0/0.png") is None
+    assert cache.get("/ab/1/0/0.png") is not None
+    assert cache.current_bytes == _entry(1).size + len("/ab/1/0/0.png")
+
+
+def test_etag_cache_expires_and_evicts(monkeypatch):
+    """ETags expire after the TTL and the oldest go first past max_entries."""
+    now = [100.0]
+    monkeypatch.setattr("app.tile_cache.time.monotonic", lambda: now[0])
+    cache = EtagCache(max_entries=2, ttl=5.0)
+    cache.put(("a", 1, 0, "0.png"), 'W/"1-1"')
+    cache.put(("a", 1, 0, "1.png"), 'W/"1-2"')
+    cache.put(("a", 1, 1, "0.png"), 'W/"1-3"')
+
+    # Oldest entry evicted to stay within max_entries
+    assert cache.get(("a", 1, 0, "0.png")) is None
+    assert cache.get(("a", 1, 0, "1.png")) == 'W/"1-2"'
+
+    now[0] = 105.5
+    assert cache.get(("a", 1, 0, "1.png")) is None
+    assert len(cache) == 1
+
+
+def test_etag_cache_invalidate_only_matching_tileset():
+    """Invalidating a tileset's ETags leaves other tilesets alone."""
+    cache = EtagCache()
+    cache.put(("a", 1, 0, "0.png"), 'W/"1-1"')
+    cache.put(("ab", 1, 0, "0.png"), 'W/"1-1"')
+
+    cache.invalidate("a")
+
+    assert cache.get(("a", 1, 0, "0.png")) is None
+    assert cache.get(("ab", 1, 0, "0.png")) == 'W/"1-1"'
+
+
+def test_directory_304_answered_from_etag_cache(client, monkeypatch):
+    """A remembered ETag answers a conditional request without disk access."""
+    first = client.get("/test_directory/10/0/0.png")
+    assert first.status_code == 200
+
+    def no_disk(*args, **kwargs):
+        raise AssertionError("conditional hit should not touch the filesystem")
+
+    monkeypatch.setattr("app.main.read_tile_file", no_disk)
+    not_modified = client.get(
+        "/test_directory/10/0/0.png", headers={"If-None-Match": first.headers["ETag"]}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == first.headers["ETag"]
+
+
+def test_middleware_caches_tar_tiles_and_serves_304(client):
+    """Tar tiles are replayed from the cache, with 304 for a matching ETag."""
+    tile_cache = client.app.state.tile_cache
+    tile_cache.clear()
+
+    first = client.get("/test_tar_uncompressed/10/0/0.png")
+    assert first.status_code == 200
+    assert len(tile_cache) == 1
+
+    second = client.get("/test_tar_uncompressed/10/0/0.png")
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["Content-Type"] == "image/png"
+    # Outer middleware still runs on cache hits
+    assert second.headers["X-Content-Type-Options"] == "nosniff"
+
+    not_modified = client.get(
+        "/test_tar_uncompressed/10/0/0.png",
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+def test_middleware_serves_304_for_if_modified_since(client):
+    """Cache hits honour If-Modified-Since against the cached Last-Modified."""
+    tile_cache = client.app.state.tile_cache
+    tile_cache.clear()
+
+    first = client.get("/test_tar_uncompressed/10/0/0.png")
+    assert len(tile_cache) == 1
+
+    not_modified = client.get(
+        "/test_tar_uncompressed/10/0/0.png",
+        headers={"If-Modified-Since": first.headers["Last-Modified"]},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    stale = client.get(
+        "/test_tar_uncompressed/10/0/0.png",
+        headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+    )
+    assert stale.status_code == 200
+    assert stale.content == first.content
+
+
+def test_middleware_does_not_cache_directory_or_errors(client):
+    """Directory tiles and error responses never enter the cache."""
+    tile_cache = client.app.state.tile_cache
+    tile_cache.clear()
+
+    assert client.get("/test_directory/10/0/0.png").status_code == 200
+    assert client.get("/test_tar_uncompressed/10/0/99.png").status_code == 404
+    assert len(tile_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_passes_uncacheable_responses_through():
+    """A non-tar response is forwarded chunk by chunk and never cached."""
+    chunks = [b"one", b"two", b""]
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"x-source-type", b"directory")],
+            }
+        )
+        for i, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": i < len(chunks) - 1,
+                }
+            )
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    cache = TileCache()
+    middleware = TileCacheMiddleware(app, cache)
+    scope = {"type": "http", "method": "GET", "path": "/a/1/0/0.png", "headers": []}
+    await middleware(scope, None, send)
+
+    assert [m.get("body") for m in sent[1:]] == chunks
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_drops_tile_read_before_index_swap():
+    """A slow read that straddles an invalidation does not re-cache old bytes."""
+    cache = TileCache()
+    read_started = asyncio.Event()
+    swap_done = asyncio.Event()
+
+    async def slow_tar_app(scope, receive, send):
+        read_started.set()
+        await swap_done.wait()  # the index is swapped while the read is in flight
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"x-source-type", b"tar")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"old bytes"})
+
+    async def send(message):
+        pass
+
+    middleware = TileCacheMiddleware(slow_tar_app, cache)
+    scope = {"type": "http", "method": "GET", "path": "/a/1/0/0.png", "headers": []}
+    request = asyncio.ensure_future(middleware(scope, None, send))
+    await read_started.wait()
+    cache.invalidate("a")
+    swap_done.set()
+    await request
+
+    assert cache.get("/a/1/0/0.png") is None
+
+    # The next read, started after the swap, is cached as usual
+    await middleware(scope, None, send)
+    assert cache.get("/a/1/0/0.png") is not None
+
+
+def test_tile_cache_put_ignores_stale_generation():
+    """put() drops an entry whose tileset was invalidated since generation()."""
+    cache = TileCache()
+    generation = cache.generation("/a/1/0/0.png")
+    other = cache.generation("/b/1/0/0.png")
+    cache.invalidate("a")
+
+    cache.put("/a/1/0/0.png", _entry(4), generation)
+    cache.put("/b/1/0/0.png", _entry(4), other)
+    assert cache.get("/a/1/0/0.png") is None
+    assert cache.get("/b/1/0/0.png") is not None
+
+
+def test_rebuild_invalidates_cached_tiles():
+    """Rebuilding a tar index drops that tileset's cached tiles."""
+    app = create_app(config_path=str(TEST_CONFIG_PATH), do_scan=False)
+    with TestClient(app) as client:
+        tile_cache = client.app.state.tile_cache
+        client.get("/test_tar_uncompressed/10/0/0.png")
+        assert len(tile_cache) == 1
+
+        response = client.post("/admin/rebuild/test_tar_uncompressed")
+        assert response.status_code == 200
+        assert len(tile_cache) == 0
+
+
+def test_tile_cache_budget_from_env(monkeypatch):
+    """TILE_LRU_BYTES sets the cache budget."""
+    monkeypatch.setenv("TILE_LRU_BYTES", "1048576")
+    app = create_app(config_path=str(TEST_CONFIG_PATH), do_scan=False)
+    assert any(m.cls is TileCacheMiddleware for m in app.user_middleware)
+
+    with TestClient(app) as client:
+        tile_cache = client.app.state.tile_cache
+        assert tile_cache.max_bytes == 1048576
+        assert client.get("/test_tar_uncompressed/10/0/0.png").status_code == 200
+        assert len(tile_cache) == 1
+
+
+def test_zero_tile_cache_budget_disables_middleware(monkeypatch):
+    """TILE_LRU_BYTES=0 leaves the cache middleware out of the stack entirely."""
+    monkeypatch.setenv("TILE_LRU_BYTES", "0")
+    app = create_app(config_path=str(TEST_CONFIG_PATH), do_scan=False)
+    assert not any(m.cls is TileCacheMiddleware for m in app.user_middleware)
+
+    with TestClient(app) as client:
+        tile_cache = client.app.state.tile_cache
+        assert tile_cache.max_bytes == 0
+        assert client.get("/test_tar_uncompressed/10/0/0.png").status_code == 200
+        assert client.get("/test_tar_uncompressed/10/0/0.png").status_code == 200
+        assert len(tile_cache) == 0
+        assert tile_cache.current_bytes == 0
@@ -1,9 +1,11 @@
 import asyncio
 import json
 import logging
+import os
 import shutil
 import tarfile
 import tempfile
+import time
 from io import BytesIO
 from pathlib import Path
 
@@ -12,6 +14,7 @@ import pytest
 from app.config import (
     auto_detect_base_path,
     load_tileset_config,
+    scan_all_tilesets,
     scan_tiles,
 )
 from app.exceptions import (
@@ -23,14 +26,26 @@ from app.exceptions import (
     TileServerError,
     TilesetNotFoundError,
 )
-from app.tar_manager import TarManager, build_tar_index
+from app.main import _worker_log_level
+from app.tar_manager import TarManager, build_tar_index, load_or_build_tar_index
+from app import tar_reader
+from app.tar_reader import read_tile
 from app.utils import (
+    check_tar_header,
     detect_tar_compression,
+    etag_matches,
     find_tile_in_tar_index,
     find_tile_path,
+    find_tile_path_with_stat,
+    http_date,
+    is_not_modified,
     is_tar_file,
+    iter_tar_members,
     media_type_for_suffix,
     parse_tile_member_path,
+    read_tile_file,
+    tar_open_mode,
+    weak_etag,
 )
 
 # Note: _find_tile_in_tar_index is tested via TarManager
@@ -64,6 +79,23 @@ def test_is_tar_file_with_directory(temp_dir):
     assert not is_tar_file(dir_path)
 
 
+def test_is_tar_file_with_directory_named_like_tar(temp_dir):
+    """Test that a directory with a tar extension is not detected"""
+    dir_path = temp_dir / "tiles.tar"
+    dir_path.mkdir()
+    assert not is_tar_file(dir_path)
+
+
+def test_is_tar_file_skips_stat_for_other_extensions(monkeypatch):
+    """Test that non-tar extensions are rejected without touching the filesystem"""
+
+    def fail_is_file(self):
+        raise AssertionError("is_file should not be called")
+
+    monkeypatch.setattr(Path, "is_file", fail_is_file)
+    assert not is_tar_file(Path("/nonexistent/tiles"))
+
+
 def test_is_tar_file_with_other_file(temp_dir):
     """Test that non-tar files are not detected"""
     file_path = temp_dir / "test.json"
@@ -95,6 +127,23 @@ def test_detect_compression_xz():
     assert detect_tar_compression(tar_path) == "xz"
 
 
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("tiles.tgz", "gzip"),
+        ("tiles.tbz2", "bzip2"),
+        ("tiles.txz", "xz"),
+        ("tiles.gz", "unknown"),
+        ("tar.gz", "unknown"),
+        ("tar", "unknown"),
+        ("tiles.zip", "unknown"),
+    ],
+)
+def test_detect_compression_by_name(name, expected):
+    """Compression comes from the file name's suffixes only."""
+    assert detect_tar_compression(Path("/data") / name) == expected
+
+
 def test_png_media_type():
     assert media_type_for_suffix(".png") == "image/png"
 
@@ -151,6 +200,16 @@ def test_parse_tile_member_path_non_digit_x():
     assert parse_tile_member_path("10/abc/3.png") is None
 
 
+def test_parse_tile_member_path_deep_prefix():
+    """Only the last three components are split off a deep prefix."""
+    assert parse_tile_member_path("a/b/c/10/5/3.png") == ("10", "5", "3.png")
+
+
+def test_parse_tile_member_path_rejects_non_decimal_digits():
+    """Digit-like characters that int() cannot parse are rejected."""
+    assert parse_tile_member_path("\u00b2/5/3.png") is None
+
+
 def test_find_existing_tile(tile_dir):
     """Test finding a tile that exists"""
     tile_path, _ = find_tile_path(tile_dir, 10, 5, "3.png")
@@ -166,6 +225,72 @@ def test_find_tile_with_extension_probing(tile_dir):
     assert tile_path.suffix == ".png"
 
 
+def test_find_tile_path_with_stat_returns_stat(tile_dir):
+    """The stat used to probe the tile is returned alongside the path"""
+    tile_path, st, _ = find_tile_path_with_stat(tile_dir, 10, 5, "3.webp")
+    assert tile_path is not None
+    assert st.st_size == tile_path.stat().st_size
+    assert st.st_mtime_ns == tile_path.stat().st_mtime_ns
+
+
+def test_find_tile_path_with_stat_skips_directories(tile_dir):
+    """A directory named like a tile is not returned"""
+    (tile_dir / "10" / "5" / "7.png").mkdir()
+    tile_path, st, tried = find_tile_path_with_stat(tile_dir, 10, 5, "7.png")
+    assert tile_path is None
+    assert st is None
+    assert tried[0] == ".png"
+
+
+def test_read_tile_file_reads_small_tiles(tile_dir):
+    """Small tiles come back as bytes; large ones and ETag matches are not read"""
+    (tile_dir / "10" / "5" / "3.webp").write_bytes(b"webp-tile")
+    _, st, data, _ = read_tile_file(tile_dir, 10, 5, "3.webp")
+    assert data == b"webp-tile"
+    assert st.st_size == len(data)
+
+    _, st, data, _ = read_tile_file(tile_dir, 10, 5, "3.webp", max_size=4)
+    assert data is None and st is not None
+
+    etag = weak_etag(st.st_mtime_ns, st.st_size)
+    _, _, data, _ = read_tile_file(tile_dir, 10, 5, "3.webp", if_none_match=etag)
+    assert data is None
+
+
+def test_etag_matches_rfc_forms():
+    """If-None-Match matches exact, listed, starred and strong/weak variants"""
+    etag = 'W/"1700000000-42"'
+    assert etag_matches(etag, etag)
+    assert etag_matches('"a", W/"1700000000-42"', etag)
+    assert etag_matches('"1700000000-42"', etag)
+    assert etag_matches(" * ", etag)
+    assert not etag_matches('W/"1700000000-43"', etag)
+    assert not etag_matches('"a", "b"', etag)
+
+
+def test_is_not_modified_prefers_if_none_match():
+    """If-Modified-Since is only used without If-None-Match, per RFC 9110"""
+    etag = 'W/"1700000000-42"'
+    date = http_date(1_700_000_000)
+    assert is_not_modified(None, date, etag, 1_700_000_000)
+    assert is_not_modified(None, date, etag, 1_699_999_999)
+    assert not is_not_modified(None, date, etag, 1_700_000_001)
+    assert not is_not_modified('"other"', date, etag, 1_700_000_000)
+    assert is_not_modified(etag, http_date(0), etag, 1_700_000_000)
+    assert not is_not_modified(None, "not a date", etag, 0)
+    assert not is_not_modified(None, None, etag, 0)
+
+
+def test_http_date_matches_formatdate():
+    """http_date formats like email.utils.formatdate and is memoized"""
+    import email.utils
+
+    http_date.cache_clear()
+    assert http_date(1700000000) == email.utils.formatdate(1700000000, usegmt=True)
+    http_date(1700000000)
+    assert http_date.cache_info().hits == 1
+
+
 def test_find_nonexistent_tile(tile_dir):
     """Test that nonexistent tiles return None"""
     tile_path, _ = find_tile_path(tile_dir, 10, 5, "999.png")
@@ -301,6 +426,16 @@ async def test_find_tile_in_tar_index(tar_file):
         await tar_manager.get_tile_from_tar("test", 99, 0, "0.png")
 
 
+def test_iter_tar_members_does_not_retain_members(tar_file):
+    """Streaming iteration yields every member but keeps tar.members empty"""
+    with tarfile.open(tar_file, "r:") as tar:
+        names = [member.name for member in iter_tar_members(tar)]
+        assert tar.members == []
+
+    assert len(names) == 8
+    assert "10/0/0.png" in names
+
+
 def test_detect_nested_base_path(temp_dir):
     """Test detection of tiles in subdirectory"""
     tar_path = temp_dir / "nested.tar"
@@ -319,6 +454,22 @@ def test_detect_nested_base_path(temp_dir):
     assert detected == "data/tiles"
 
 
+def test_detect_base_path_stops_at_min_hits(temp_dir):
+    """Detection settles on the first base seen min_hits times"""
+    tar_path = temp_dir / "early.tar"
+    with tarfile.open(tar_path, "w") as tar:
+        names = [f"first/10/{i}/0.png" for i in range(3)]
+        names += [f"second/10/{i}/0.png" for i in range(10)]
+        for name in names:
+            tile_info = tarfile.TarInfo(name=name)
+            tile_info.size = 4
+            tar.addfile(tile_info, BytesIO(b"fake"))
+
+    assert auto_detect_base_path(tar_path) == "first"
+    # Without the early exit the majority base wins
+    assert auto_detect_base_path(tar_path, min_hits=100) == "second"
+
+
 def test_detect_root_level_tiles(temp_dir):
     """Test detection of tiles at root level"""
     tar_path = temp_dir / "root.tar"
@@ -384,6 +535,15 @@ def test_detect_compression_unknown():
     assert detect_tar_compression(tar_path) == "unknown"
 
 
+def test_tar_open_mode_explicit_per_compression():
+    """Known extensions map to explicit modes instead of "r:*" probing"""
+    assert tar_open_mode(Path("tiles.tar")) == "r:"
+    assert tar_open_mode(Path("tiles.tar.gz")) == "r:gz"
+    assert tar_open_mode(Path("tiles.tbz2")) == "r:bz2"
+    assert tar_open_mode(Path("tiles.txz")) == "r:xz"
+    assert tar_open_mode(Path("tiles.unknown")) == "r:*"
+
+
 # ============================================================================
 # Exception Tests
 # ============================================================================
@@ -619,6 +779,200 @@ def test_load_compressed_tar_raises_error(temp_dir):
         load_tileset_config(str(config_path))
 
 
+def test_load_config_reuses_validation_for_unchanged_files(temp_dir, monkeypatch):
+    """A second load of an unchanged config skips re-opening its tar archives."""
+    from app import config as config_module
+
+    monkeypatch.setattr(config_module, "_VALIDATED_CACHE", {})
+
+    tar_path = temp_dir / "tiles.tar"
+    with tarfile.open(tar_path, "w") as tar:
+        tile_info = tarfile.TarInfo(name="tiles/10/0/0.png")
+        tile_info.size = 4
+        tar.addfile(tile_info, BytesIO(b"fake"))
+    config_path = temp_dir / "config.json"
+    config_path.write_text(json.dumps({"tilesets": {"test_tar": str(tar_path)}}))
+
+    first = load_tileset_config(str(config_path))
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("tar should not be reopened on a cache hit")
+
+    monkeypatch.setattr(tarfile, "open", fail_open)
+    second = load_tileset_config(str(config_path))
+
+    assert second == first
+    assert second["test_tar"]["base_path"] == "tiles"
+    # The validation cache never leaves the process
+    assert not (temp_dir / "cache").exists()
+
+
+def test_load_config_cache_re_resolves_relative_sources(temp_dir, monkeypatch):
+    """A relative source is re-resolved against the current working directory."""
+    from app import config as config_module
+
+    monkeypatch.setattr(config_module, "_VALIDATED_CACHE", {})
+
+    for cwd in ("A", "B"):
+        (temp_dir / cwd / "tiles").mkdir(parents=True)
+    config_path = temp_dir / "config.json"
+    config_path.write_text(json.dumps({"tilesets": {"osm": "tiles"}}))
+
+    monkeypatch.chdir(temp_dir / "A")
+    first = load_tileset_config(str(config_path))
+    monkeypatch.chdir(temp_dir / "B")
+    second = load_tileset_config(str(config_path))
+
+    assert first["osm"]["source_path"] == (temp_dir / "A" / "tiles").resolve()
+    assert second["osm"]["source_path"] == (temp_dir / "B" / "tiles").resolve()
+
+
+def test_load_config_cache_follows_repointed_symlink(temp_dir, monkeypatch):
+    """Re-pointing a source symlink invalidates the cached resolution."""
+    from app import config as config_module
+
+    monkeypatch.setattr(config_module, "_VALIDATED_CACHE", {})
+
+    (temp_dir / "old").mkdir()
+    (temp_dir / "new").mkdir()
+    link = temp_dir / "current"
+    link.symlink_to(temp_dir / "old")
+    config_path = temp_dir / "config.json"
+    config_path.write_text(json.dumps({"tilesets": {"osm": str(link)}}))
+
+    first = load_tileset_config(str(config_path))
+    link.unlink()
+    link.symlink_to(temp_dir / "new")
+    second = load_tileset_config(str(config_path))
+
+    assert first["osm"]["source_path"] == (temp_dir / "old").resolve()
+    assert second["osm"]["source_path"] == (temp_dir / "new").resolve()
+
+
+def test_directory_only_import_skips_tarfile():
+    """Importing the app does not pull in tarfile until a tar is configured."""
+    import subprocess
+    import sys
+
+    code = "import sys, app.main; print('tarfile' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_check_tar_header_accepts_valid_and_empty_tars(temp_dir):
+    """A real tar and an empty tar both pass the first-block check."""
+    tar_path = temp_dir / "tiles.tar"
+    with tarfile.open(tar_path, "w") as tar:
+        tile_info = tarfile.TarInfo(name="10/0/0.png")
+        tile_info.size = 4
+        tar.addfile(tile_info, BytesIO(b"fake"))
+    empty_path = temp_dir / "empty.tar"
+    with tarfile.open(empty_path, "w"):
+        pass
+
+    check_tar_header(tar_path)
+    check_tar_header(empty_path)
+
+
+def test_check_tar_header_rejects_garbage(temp_dir):
+    """Short files and blocks with a bad checksum are rejected."""
+    short_path = temp_dir / "short.tar"
+    short_path.write_bytes(b"not a tar")
+    garbage_path = temp_dir / "garbage.tar"
+    garbage_path.write_bytes(b"x" * 1024)
+
+    with pytest.raises(ValueError, match="too short"):
+        check_tar_header(short_path)
+    with pytest.raises(ValueError, match="checksum"):
+        check_tar_header(garbage_path)
+
+
+def test_load_config_explicit_base_path_rejects_invalid_tar(temp_dir):
+    """An explicit base_path still validates the archive header."""
+    tar_path = temp_dir / "broken.tar"
+    tar_path.write_bytes(b"x" * 1024)
+    config_path = temp_dir / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {"tilesets": {"broken": {"source": str(tar_path), "base_path": "tiles"}}}
+        )
+    )
+
+    with pytest.raises(ValueError, match="invalid tar header checksum"):
+        load_tileset_config(str(config_path))
+
+
+def test_load_config_directory_named_like_tar(temp_dir, monkeypatch):
+    """A directory with a tar extension is validated as a directory source."""
+    from app import config as config_module
+
+    monkeypatch.setattr(config_module, "_VALIDATED_CACHE", {})
+
+    tile_dir = temp_dir / "tiles.tar"
+    tile_dir.mkdir()
+    config_path = temp_dir / "config.json"
+    config_path.write_text(json.dumps({"tilesets": {"tiles": str(tile_dir)}}))
+
+    tilesets = load_tileset_config(str(config_path))
+
+    assert tilesets["tiles"]["source_type"] == "directory"
+
+
+def test_load_config_interns_base_paths(temp_dir, monkeypatch):
+    """Tilesets sharing a tar share one base_path string object."""
+    from app import config as config_module
+
+    monkeypatch.setattr(config_module, "_VALIDATED_CACHE", {})
+
+    tar_path = temp_dir / "tiles.tar"
+    with tarfile.open(tar_path, "w") as tar:
+        tile_info = tarfile.TarInfo(name="tiles/10/0/0.png")
+        tile_info.size = 4
+        tar.addfile(tile_info, BytesIO(b"fake"))
+    config_path = temp_dir / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "tilesets": {
+                    "detected": str(tar_path),
+                    "explicit": {"source": str(tar_path), "base_path": "tiles"},
+                }
+            }
+        )
+    )
+
+    tilesets = load_tileset_config(str(config_path))
+
+    assert tilesets["detected"]["base_path"] is tilesets["explicit"]["base_path"]
+
+
+def test_load_config_revalidates_when_source_changes(temp_dir, monkeypatch):
+    """Changing a tar after validation invalidates the cached result."""
+    from app import config as config_module
+
+    monkeypatch.setattr(config_module, "_VALIDATED_CACHE", {})
+
+    tar_path = temp_dir / "tiles.tar"
+    with tarfile.open(tar_path, "w") as tar:
+        tile_info = tarfile.TarInfo(name="old/10/0/0.png")
+        tile_info.size = 4
+        tar.addfile(tile_info, BytesIO(b"fake"))
+    config_path = temp_dir / "config.json"
+    config_path.write_text(json.dumps({"tilesets": {"test_tar": str(tar_path)}}))
+
+    assert load_tileset_config(str(config_path))["test_tar"]["base_path"] == "old"
+
+    with tarfile.open(tar_path, "w") as tar:
+        for y in range(3):
+            tile_info = tarfile.TarInfo(name=f"new/10/0/{y}.png")
+            tile_info.size = 4
+            tar.addfile(tile_info, BytesIO(b"fake"))
+
+    assert load_tileset_config(str(config_path))["test_tar"]["base_path"] == "new"
+
+
 # ============================================================================
 # TarManager Tests
 # ============================================================================
@@ -646,9 +1000,9 @@ async def test_tar_manager_initialize_and_close(temp_dir):
     assert tar_manager.index_status["test"]["status"] == "ready"
     assert tar_manager.index_status["test"]["tile_count"] == 1
 
-    assert "test" in tar_manager.mmaps
+    assert "test" in tar_manager.tar_files
     await tar_manager.close_all()
-    assert "test" not in tar_manager.mmaps
+    assert "test" not in tar_manager.tar_files
 
 
 @pytest.mark.asyncio
@@ -720,8 +1074,8 @@ async def test_tar_manager_extension_probing(temp_dir):
 
 
 @pytest.mark.asyncio
-async def test_tar_manager_uses_mmap(temp_dir):
-    """TarManager holds one mmap per tileset — no shared tar handle, no per-request FDs."""
+async def test_tar_manager_keeps_one_handle_per_tileset(temp_dir):
+    """TarManager holds one open file per tileset — no per-request FDs."""
     tar_path = temp_dir / "test.tar"
     with tarfile.open(tar_path, "w") as tar:
         tile_data = b"fake tile"
@@ -736,12 +1090,115 @@ async def test_tar_manager_uses_mmap(temp_dir):
     assert not hasattr(tar_manager, "tileset_locks")
     assert not hasattr(tar_manager, "source_paths")
     assert not hasattr(tar_manager, "compression_types")
-    import mmap as mmap_mod
 
-    assert "test" in tar_manager.mmaps
-    assert isinstance(tar_manager.mmaps["test"], mmap_mod.mmap)
+    fh = tar_manager.tar_files["test"]
+    await tar_manager.get_tile_from_tar("test", 10, 0, "0.png")
+    assert tar_manager.tar_files["test"] is fh
 
     await tar_manager.close_all()
+    assert fh.closed
+
+
+@pytest.mark.asyncio
+async def test_tar_manager_shares_handle_between_tilesets(temp_dir):
+    """Tilesets backed by one tar share a handle; a rebuild leaves the other open."""
+    tar_path = temp_dir / "shared.tar"
+    with tarfile.open(tar_path, "w") as tar:
+        for base in ("a", "b"):
+            tile_info = tarfile.TarInfo(name=f"{base}/10/0/0.png")
+            tile_info.size = 4
+            tar.addfile(tile_info, BytesIO(b"tile"))
+
+    tar_manager = TarManager()
+    await tar_manager.initialize_tileset("a", tar_path, "a")
+    await tar_manager.initialize_tileset("b", tar_path, "b")
+    shared = tar_manager.tar_files["a"]
+    assert tar_manager.tar_files["b"] is shared
+
+    # Same file on disk: the rebuilt tileset re-acquires the shared handle
+    await tar_manager.rebuild_index("a", tar_path, "a")
+    assert tar_manager.tar_files["a"] is shared
+    assert not shared.closed
+
+    tile_data, _, _ = await tar_manager.get_tile_from_tar("b", 10, 0, "0.png")
+    assert tile_data == b"tile"
+
+    await tar_manager.close_all()
+    assert shared.closed
+
+
+@pytest.mark.asyncio
+async def test_rebuild_keeps_old_handle_open_for_in_flight_reads(temp_dir):
+    """A handle swapped out by a rebuild is closed only after a grace delay."""
+
+    def write_tar(path, data):
+        with tarfile.open(path, "w") as tar:
+            tile_info = tarfile.TarInfo(name="10/0/0.png")
+            tile_info.size = len(data)
+            tar.addfile(tile_info, BytesIO(data))
+
+    tar_path = temp_dir / "tiles.tar"
+    write_tar(tar_path, b"old")
+    tar_manager = TarManager()
+    tar_manager._handle_release_delay = 0.05
+    await tar_manager.initialize_tileset("test", tar_path)
+    old_fh = tar_manager.tar_files["test"]
+    old_entry = tar_manager.tar_indexes["test"]["10/0/0.png"]
+
+    # Replace the archive (new inode) and rebuild onto it
+    new_path = temp_dir / "tiles.tar.new"
+    write_tar(new_path, b"new!")
+    new_path.replace(tar_path)
+    await tar_manager.rebuild_index("test", tar_path)
+
+    assert tar_manager.tar_files["test"] is not old_fh
+    assert not old_fh.closed
+    assert await read_tile(old_fh, old_entry.offset, old_entry.size) == b"old"
+
+    await asyncio.sleep(0.1)
+    assert old_fh.closed
+    tile_data, _, _ = await tar_manager.get_tile_from_tar("test", 10, 0, "0.png")
+    assert tile_data == b"new!"
+
+    await tar_manager.close_all()
+
+
+@pytest.mark.asyncio
+async def test_read_tile_rejects_short_read(temp_dir):
+    """read_tile returns exact bytes and raises when the file is truncated."""
+    path = temp_dir / "data.bin"
+    path.write_bytes(b"0123456789")
+
+    with open(path, "rb") as fh:
+        assert await read_tile(fh, 2, 4) == b"2345"
+        with pytest.raises(OSError, match="short read"):
+            await read_tile(fh, 8, 4)
+
+
+@pytest.mark.asyncio
+async def test_read_tile_inline_when_cached(temp_dir, monkeypatch):
+    """Cached small tiles skip the pool; uncached ones still go through it."""
+    path = temp_dir / "data.bin"
+    path.write_bytes(b"0123456789")
+
+    with open(path, "rb") as fh:
+        if not tar_reader._HAS_RWF_NOWAIT or tar_reader._pread_cached(fh, 0, 1) is None:
+            pytest.skip("preadv(RWF_NOWAIT) unavailable on this platform/filesystem")
+
+        pool_reads = []
+        real_pread_exact = tar_reader._pread_exact
+
+        def counting_pread_exact(*args):
+            pool_reads.append(args)
+            return real_pread_exact(*args)
+
+        monkeypatch.setattr(tar_reader, "_pread_exact", counting_pread_exact)
+        assert await read_tile(fh, 2, 4) == b"2345"
+        assert pool_reads == []
+
+        monkeypatch.setattr(tar_reader, "_pread_cached", lambda *args: None)
+        assert await read_tile(fh, 2, 4) == b"2345"
+        assert len(pool_reads) == 1
 
 
 @pytest.mark.asyncio
@@ -817,6 +1274,32 @@ def test_scan_tiles_tar(temp_dir):
     assert complete is True
 
 
+def test_scan_tiles_tar_cached_index_matches_walk(temp_dir):
+    """Scanning from the .idx cache reports the same tiles as walking the tar."""
+    tar_path = temp_dir / "tiles.tar"
+    with tarfile.open(tar_path, "w") as tar:
+        tile_data = b"fake"
+        for name in [
+            "base/05/07/1.png",
+            "base/5/7/1.png",  # same tile once z and x are normalised
+            "base/5/7/2.png",
+            "base/5/7/2.png",  # the same member added twice
+            "other/6/0/0.png",  # outside base_path
+        ]:
+            tile_info = tarfile.TarInfo(name=name)
+            tile_info.size = len(tile_data)
+            tar.addfile(tile_info, BytesIO(tile_data))
+
+    walked = scan_tiles(tar_path, "tar", base_path="base")
+    load_or_build_tar_index(tar_path)
+    cached = scan_tiles(tar_path, "tar", base_path="base")
+
+    assert walked == cached
+    assert walked[0] == 2
+    assert walked[1] == ["5/7/1.png", "5/7/2.png"]
+    assert walked[2] == [5]
+
+
 def test_scan_tiles_tar_with_base_path(temp_dir):
     """Test scanning tiles from tar archive with base_path."""
     tar_path = temp_dir / "tiles.tar"
@@ -836,6 +1319,49 @@ def test_scan_tiles_tar_with_base_path(temp_dir):
     assert complete is True
 
 
+def test_scan_tiles_directory_reuses_unchanged_column_counts(temp_dir, monkeypatch):
+    """Columns whose mtime matches the previous scan are not listed again."""
+    from app import config as config_module
+
+    monkeypatch.setenv("TILE_SCAN_CACHE_DIR", str(temp_dir / "cache"))
+    tiles = temp_dir / "tiles"
+    old = time.time() - 60  # outside the racy window
+    for x in [0, 1]:
+        tile_dir = tiles / "10" / str(x)
+        tile_dir.mkdir(parents=True)
+        (tile_dir / "0.png").touch()
+        os.utime(tile_dir, (old, old))
+
+    assert scan_tiles(tiles, "directory", max_samples=0)[0] == 2
+    cache_file = config_module._scan_cache_file(tiles)
+    assert cache_file.exists()
+
+    # Prove column 1 is served from the cache: give it a count only the
+    # cache knows about
+    counts = config_module._load_scan_cache(tiles)
+    column = str(tiles / "10" / "1")
+    counts[column] = (counts[column][0], 7)
+    config_module._store_scan_cache(tiles, counts)
+    assert scan_tiles(tiles, "directory", max_samples=0)[0] == 8
+
+    # Adding a tile changes the column's mtime, so it is counted again
+    (tiles / "10" / "1" / "1.png").touch()
+    assert scan_tiles(tiles, "directory", max_samples=0)[0] == 3
+
+
+def test_scan_tiles_directory_cache_is_opt_in(temp_dir, monkeypatch):
+    """Without TILE_SCAN_CACHE_DIR the scan writes no cache file anywhere."""
+    from app import config as config_module
+
+    monkeypatch.delenv("TILE_SCAN_CACHE_DIR", raising=False)
+    tile_dir = temp_dir / "tiles" / "10" / "0"
+    tile_dir.mkdir(parents=True)
+    (tile_dir / "0.png").touch()
+
+    assert scan_tiles(temp_dir / "tiles", "directory")[0] == 1
+    assert config_module._scan_cache_file(temp_dir / "tiles") is None
+
+
 def test_scan_tiles_directory_zoom_discovery_survives_timeout(temp_dir):
     """All zoom dirs are discovered even when tile counting times out."""
     for z in [5, 10, 15]:
@@ -1023,6 +1549,27 @@ def test_scan_tiles_tar_base_path_with_timeout(temp_dir):
     assert complete_partial is False
 
 
+def test_scan_all_tilesets_parallel_preserves_order(temp_dir):
+    """Multiple tilesets are scanned in a process pool and keyed in config order."""
+    tilesets = {}
+    for name, zooms in [("beta", [3]), ("alpha", [5, 6]), ("gamma", [])]:
+        tileset_dir = temp_dir / name
+        tileset_dir.mkdir()
+        for z in zooms:
+            tile_dir = tileset_dir / str(z) / "0"
+            tile_dir.mkdir(parents=True)
+            (tile_dir / "0.png").touch()
+        tilesets[name] = {"source_type": "directory", "source_path": tileset_dir}
+
+    metadata = scan_all_tilesets(tilesets)
+
+    assert list(metadata) == ["beta", "alpha", "gamma"]
+    assert metadata["beta"]["zoom_levels"] == [3]
+    assert metadata["alpha"]["tile_count"] == 2
+    assert metadata["alpha"]["sample_tiles"][0].startswith("/alpha/")
+    assert metadata["gamma"]["tile_count"] == 0
+
+
 # ============================================================================
 # find_tile_in_tar_index Tests
 # ============================================================================
@@ -1059,3 +1606,16 @@ def test_find_tile_in_tar_index_not_found():
     result, tried = find_tile_in_tar_index(tar_index, 10, 5, "999.png")
     assert result is None
     assert len(tried) > 0  # Should have tried multiple extensions
+
+
+def test_worker_log_level_follows_event_mode(monkeypatch):
+    """Event-mode workers log at WARNING unless TILE_LOG_LEVEL overrides it."""
+    monkeypatch.delenv("TILE_LOG_LEVEL", raising=False)
+    assert _worker_log_level(event_mode=True) == logging.WARNING
+    assert _worker_log_level(event_mode=False) == logging.INFO
+
+    monkeypatch.setenv("TILE_LOG_LEVEL", "debug")
+    assert _worker_log_level(event_mode=True) == logging.DEBUG
+
+    monkeypatch.setenv("TILE_LOG_LEVEL", "chatty")
+    assert _worker_log_level(event_mode=False) == logging.INFO